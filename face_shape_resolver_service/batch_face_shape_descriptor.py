@@ -0,0 +1,94 @@
+"""
+Batch face shape analysis spread across worker processes
+
+MediaPipe inference holds the GIL for most of its runtime, so threads alone can't keep a multi-core
+machine busy. Batches run on a long-lived process pool where each worker process initializes
+exactly one FaceMesh up front and reuses it for every image it is handed.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from config import FACE_BATCH_MAX_IMAGES, FACE_BATCH_PROCESS_COUNT
+
+logger = logging.getLogger(__name__)
+
+
+def _init_batch_worker() -> None:
+    # Each worker process gets a single warm FaceMesh since it only ever runs one image at a time
+    from face_mesh_pool import init_face_mesh_pool
+    init_face_mesh_pool(size=1, warm=True)
+
+
+def _describe_in_worker(image_path: str) -> Dict[str, Any]:
+    from media_pipe_face_shape_descriptor import describe_face_shape
+
+    entry: Dict[str, Any] = {"image": image_path, "result": None, "error": None}
+    try:
+        if not os.path.exists(image_path):
+            entry["error"] = "Image not found"
+            return entry
+        result = describe_face_shape(image_path)
+        if result is None:
+            entry["error"] = "No face detected"
+            return entry
+        entry["result"] = result
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    return entry
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_batch_executor() -> ProcessPoolExecutor:
+    """Get the process pool used for batch analysis, starting its workers on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # Spawn rather than fork so workers never inherit MediaPipe threads from the parent
+                _executor = ProcessPoolExecutor(
+                    max_workers=FACE_BATCH_PROCESS_COUNT,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_batch_worker,
+                )
+                logger.info(f"Started batch executor with {FACE_BATCH_PROCESS_COUNT} worker processes")
+    return _executor
+
+
+def shutdown_batch_executor() -> None:
+    """Stop the batch worker processes if they were started."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+atexit.register(shutdown_batch_executor)
+
+
+def describe_face_shapes(image_paths: List[str]) -> List[Dict[str, Any]]:
+    """
+    Describe the face shape of every image in image_paths.
+
+    Returns one entry per input image, in input order, shaped as
+    {"image": path, "result": {face_shape, measurements} | None, "error": str | None}
+    so a bad image doesn't fail the rest of the batch.
+    """
+    if len(image_paths) > FACE_BATCH_MAX_IMAGES:
+        raise ValueError(f"Batch of {len(image_paths)} images exceeds the limit of {FACE_BATCH_MAX_IMAGES}")
+    if not image_paths:
+        return []
+
+    executor = get_batch_executor()
+    # Hand out a few images per task so IPC overhead stays small relative to inference
+    chunksize = max(1, len(image_paths) // (FACE_BATCH_PROCESS_COUNT * 4))
+    return list(executor.map(_describe_in_worker, image_paths, chunksize=chunksize))
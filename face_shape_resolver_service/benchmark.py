@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark suite for the face shape pipeline
+
+Runs the bundled test1.jpg - test3.jpg plus synthetic resized copies through each pipeline stage and
+reports p50/p95/p99 latency per stage, images/sec at 1..N workers, peak RSS and cold vs warm first
+call time. Results are written as JSON so runs can be compared across commits and dependency upgrades:
+
+    python benchmark.py --output bench.json
+    python benchmark.py --output bench-new.json --compare bench.json
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+import cv2
+import numpy as np
+
+from config import FACE_MAX_INPUT_EDGE
+from face_geometry import compute_measurements, landmarks_to_array
+from face_mesh_pool import init_face_mesh_pool
+from image_preprocessing import prepare_image
+from media_pipe_face_shape_descriptor import describe_face_image, determine_face_shape
+
+SERVICE_DIR = Path(__file__).parent
+BUNDLED_IMAGES = ["test1.jpg", "test2.jpg", "test3.jpg"]
+# Synthetic copies at these scales stand in for small webcam frames up to large phone photos
+SYNTHETIC_SCALES = [0.5, 2.0, 4.0]
+STAGES = ["decode", "preprocess", "inference", "landmarks", "measurements", "classify"]
+
+
+def load_benchmark_images() -> Dict[str, bytes]:
+    """Encoded JPEG bytes of each bundled image and its synthetic resized copies, keyed by name"""
+    images = {}
+    for name in BUNDLED_IMAGES:
+        encoded = (SERVICE_DIR / name).read_bytes()
+        images[name] = encoded
+        image = cv2.imdecode(np.frombuffer(encoded, dtype=np.uint8), cv2.IMREAD_COLOR)
+        for scale in SYNTHETIC_SCALES:
+            resized = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA)
+            ok, resized_encoded = cv2.imencode(".jpg", resized, [cv2.IMWRITE_JPEG_QUALITY, 92])
+            assert ok
+            images[f"{Path(name).stem}@{scale}x.jpg"] = resized_encoded.tobytes()
+    return images
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    values = np.array(samples) * 1000
+    return {
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "mean_ms": float(values.mean()),
+        "n": len(samples),
+    }
+
+
+def run_stages_once(encoded: bytes, face_mesh, max_edge: int) -> Dict[str, float]:
+    """Run the describe pipeline by hand so every stage can be timed separately"""
+    timings = {}
+    start = time.perf_counter()
+    image = cv2.imdecode(np.frombuffer(encoded, dtype=np.uint8), cv2.IMREAD_COLOR)
+    timings["decode"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    prepared = prepare_image(image, max_edge=max_edge, crop_to_face=False)
+    timings["preprocess"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = face_mesh.process(prepared.image_rgb)
+    timings["inference"] = time.perf_counter() - start
+    if not results.multi_face_landmarks:
+        return timings
+
+    start = time.perf_counter()
+    landmarks = landmarks_to_array(results.multi_face_landmarks[0], prepared.region_width, prepared.region_height)
+    timings["landmarks"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    measurements = compute_measurements(landmarks)
+    timings["measurements"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    determine_face_shape(float(measurements["height_width_ratio"]), float(measurements["jaw_face_ratio"]))
+    timings["classify"] = time.perf_counter() - start
+    return timings
+
+
+def benchmark_stages(images: Dict[str, bytes], iterations: int, max_edge: int) -> Dict[str, Any]:
+    pool = init_face_mesh_pool(size=1, warm=True)
+    per_image = {}
+    overall: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    with pool.checkout() as face_mesh:
+        for name, encoded in images.items():
+            samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+            for _ in range(iterations):
+                for stage, seconds in run_stages_once(encoded, face_mesh, max_edge).items():
+                    samples[stage].append(seconds)
+                    overall[stage].append(seconds)
+            per_image[name] = {stage: percentiles(s) for stage, s in samples.items() if s}
+    return {
+        "overall": {stage: percentiles(s) for stage, s in overall.items() if s},
+        "per_image": per_image,
+    }
+
+
+def benchmark_throughput(images: Dict[str, bytes], max_workers: int, images_per_run: int) -> Dict[str, Any]:
+    decoded = [cv2.imdecode(np.frombuffer(encoded, dtype=np.uint8), cv2.IMREAD_COLOR) for encoded in images.values()]
+    workload = [decoded[i % len(decoded)] for i in range(images_per_run)]
+    throughput = {}
+    for workers in range(1, max_workers + 1):
+        init_face_mesh_pool(size=workers, warm=True)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            start = time.perf_counter()
+            list(executor.map(lambda image: describe_face_image(image, use_cache=False), workload))
+            elapsed = time.perf_counter() - start
+        throughput[str(workers)] = {"images_per_sec": images_per_run / elapsed, "seconds": elapsed}
+        print(f"  {workers} worker(s): {images_per_run / elapsed:.1f} images/sec")
+    return throughput
+
+
+# Runs in a fresh interpreter so imports, model loading and graph setup are all genuinely cold
+COLD_START_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import cv2
+from media_pipe_face_shape_descriptor import describe_face_image, describe_face_shape
+import_seconds = time.perf_counter() - start
+
+start = time.perf_counter()
+describe_face_shape(sys.argv[1])
+cold_seconds = time.perf_counter() - start
+
+image = cv2.imread(sys.argv[1])
+start = time.perf_counter()
+describe_face_image(image, use_cache=False)
+warm_seconds = time.perf_counter() - start
+
+print(json.dumps({
+    "import_ms": import_seconds * 1000,
+    "cold_first_call_ms": cold_seconds * 1000,
+    "warm_call_ms": warm_seconds * 1000,
+}))
+"""
+
+
+def benchmark_cold_start() -> Dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", COLD_START_PROBE, str(SERVICE_DIR / BUNDLED_IMAGES[0])],
+        cwd=SERVICE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # MediaPipe logs to stdout too, the probe's JSON is the last line
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def environment_info() -> Dict[str, Any]:
+    import mediapipe as mp
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=SERVICE_DIR, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "mediapipe": mp.__version__,
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print("\nStage p50 vs baseline:")
+    for stage, stats in current["stages"]["overall"].items():
+        base = baseline.get("stages", {}).get("overall", {}).get(stage)
+        if base:
+            change = (stats["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100
+            print(f"  {stage:<13} {base['p50_ms']:8.2f}ms -> {stats['p50_ms']:8.2f}ms ({change:+.1f}%)")
+    print("Throughput vs baseline:")
+    for workers, stats in current["throughput"].items():
+        base = baseline.get("throughput", {}).get(workers)
+        if base:
+            change = (stats["images_per_sec"] - base["images_per_sec"]) / base["images_per_sec"] * 100
+            print(f"  {workers} worker(s)  {base['images_per_sec']:8.1f}/s -> {stats['images_per_sec']:8.1f}/s ({change:+.1f}%)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the face shape pipeline")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed runs per image for stage latency")
+    parser.add_argument("--max-workers", type=int, default=4, help="Measure throughput at 1..N workers")
+    parser.add_argument("--images-per-run", type=int, default=48, help="Images processed per throughput run")
+    parser.add_argument("--max-edge", type=int, default=FACE_MAX_INPUT_EDGE)
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this path")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON from an earlier run to compare against")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("Measuring cold vs warm first call...")
+    cold_start = benchmark_cold_start()
+    images = load_benchmark_images()
+    print(f"Timing stages over {len(images)} images x {args.iterations} iterations...")
+    stages = benchmark_stages(images, args.iterations, args.max_edge)
+    print("Measuring throughput...")
+    throughput = benchmark_throughput(images, args.max_workers, args.images_per_run)
+
+    report = {
+        "environment": environment_info(),
+        "settings": vars(args) | {"output": str(args.output), "compare": str(args.compare)},
+        "cold_start": cold_start,
+        "stages": stages,
+        "throughput": throughput,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    print("\nStage latency (all images):")
+    for stage, stats in stages["overall"].items():
+        print(f"  {stage:<13} p50 {stats['p50_ms']:8.2f}ms  p95 {stats['p95_ms']:8.2f}ms  p99 {stats['p99_ms']:8.2f}ms")
+    print(f"Cold first call {cold_start['cold_first_call_ms']:.0f}ms vs warm {cold_start['warm_call_ms']:.0f}ms")
+    print(f"Peak RSS {report['peak_rss_mb']:.0f}MB")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nWrote results to {args.output}")
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
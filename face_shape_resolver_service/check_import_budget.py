@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the Face Descriptor service entry points
+
+Imports the serving modules in fresh interpreters and fails (exit code 1) if startup exceeds
+FACE_IMPORT_BUDGET_MS or if a heavy module leaks onto the import path. mediapipe and cv2 belong in
+the FaceMesh pool initializer, and matplotlib only in the local demo.
+
+    python check_import_budget.py
+    python check_import_budget.py --budget-ms 1200 --runs 5
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from config import FACE_IMPORT_BUDGET_MS
+
+SERVICE_DIR = Path(__file__).parent
+ENTRY_POINTS = ["web_server", "mcp_server"]
+FORBIDDEN_AT_IMPORT = ["matplotlib", "mediapipe", "cv2"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in sys.argv[1].split(","):
+    __import__(name)
+elapsed_ms = (time.perf_counter() - start) * 1000
+loaded = sorted(name for name in sys.argv[2].split(",") if name in sys.modules)
+print(json.dumps({"import_ms": elapsed_ms, "forbidden_loaded": loaded}))
+"""
+
+
+def measure_import(runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE, ",".join(ENTRY_POINTS), ",".join(FORBIDDEN_AT_IMPORT)],
+            cwd=SERVICE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    # Best of N filters out noise from a busy machine, regressions still show up in the minimum
+    return {
+        "import_ms": min(sample["import_ms"] for sample in samples),
+        "forbidden_loaded": sorted({name for sample in samples for name in sample["forbidden_loaded"]}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail when the face service's import time regresses")
+    parser.add_argument("--budget-ms", type=float, default=FACE_IMPORT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    result = measure_import(args.runs)
+    print(f"Importing {', '.join(ENTRY_POINTS)} took {result['import_ms']:.0f}ms (budget {args.budget_ms:.0f}ms)")
+
+    failed = False
+    if result["forbidden_loaded"]:
+        print(f"❌ Heavy modules loaded at import time: {', '.join(result['forbidden_loaded'])}")
+        failed = True
+    if result["import_ms"] > args.budget_ms:
+        print(f"❌ Import time over budget by {result['import_ms'] - args.budget_ms:.0f}ms")
+        failed = True
+    if not failed:
+        print("✅ Import time within budget")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
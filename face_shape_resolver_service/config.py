@@ -0,0 +1,65 @@
+"""
+Configuration for Face Descriptor service
+
+Tunables are read from environment variables so deployments can size the service per node.
+"""
+
+import os
+from pathlib import Path
+
+# FaceMesh model pool
+# Defaults to one initialized FaceMesh per available core
+FACE_MESH_POOL_SIZE = int(os.getenv("FACE_MESH_POOL_SIZE", os.cpu_count() or 1))
+# Seconds a request waits to check out a FaceMesh before giving up
+FACE_MESH_CHECKOUT_TIMEOUT_SECS = float(os.getenv("FACE_MESH_CHECKOUT_TIMEOUT_SECS", 30))
+FACE_MESH_MIN_DETECTION_CONFIDENCE = float(os.getenv("FACE_MESH_MIN_DETECTION_CONFIDENCE", 0.5))
+# Most faces found in one group photo
+FACE_MULTI_MAX_FACES = int(os.getenv("FACE_MULTI_MAX_FACES", 8))
+
+# Batch analysis
+# Worker processes for batch requests, each holding one warm FaceMesh
+FACE_BATCH_PROCESS_COUNT = int(os.getenv("FACE_BATCH_PROCESS_COUNT", os.cpu_count() or 1))
+FACE_BATCH_MAX_IMAGES = int(os.getenv("FACE_BATCH_MAX_IMAGES", 256))
+
+# Annotation rendering, only done when a caller asks for it
+FACE_ANNOTATION_JPEG_QUALITY = int(os.getenv("FACE_ANNOTATION_JPEG_QUALITY", 85))
+
+# Result cache keyed by decoded image content
+FACE_CACHE_MAX_ENTRIES = int(os.getenv("FACE_CACHE_MAX_ENTRIES", 1024))
+# Set to a directory to keep cached results across restarts
+FACE_CACHE_DIR = os.getenv("FACE_CACHE_DIR") or None
+
+# Preprocessing before inference
+# Longest image edge handed to FaceMesh, larger inputs are downsized first (0 disables)
+FACE_MAX_INPUT_EDGE = int(os.getenv("FACE_MAX_INPUT_EDGE", 1280))
+# Crop to the face found by a cheap FaceDetection pass before running FaceMesh
+FACE_CROP_TO_FACE = os.getenv("FACE_CROP_TO_FACE", "false").lower() in ("1", "true", "yes")
+# Fraction of the detected face box added on each side of the crop
+FACE_ROI_MARGIN = float(os.getenv("FACE_ROI_MARGIN", 0.35))
+# Longest edge of the thumbnail the ROI detector runs on
+FACE_ROI_DETECTION_EDGE = int(os.getenv("FACE_ROI_DETECTION_EDGE", 320))
+FACE_DETECTION_MIN_CONFIDENCE = float(os.getenv("FACE_DETECTION_MIN_CONFIDENCE", 0.5))
+
+# HTTP inference admission
+# Requests running inference at once, defaults to the FaceMesh pool size
+FACE_HTTP_MAX_CONCURRENCY = int(os.getenv("FACE_HTTP_MAX_CONCURRENCY", FACE_MESH_POOL_SIZE))
+# Requests allowed to wait for a worker before new ones are rejected with 503
+FACE_HTTP_MAX_QUEUE = int(os.getenv("FACE_HTTP_MAX_QUEUE", FACE_HTTP_MAX_CONCURRENCY * 2))
+FACE_HTTP_RETRY_AFTER_SECS = int(os.getenv("FACE_HTTP_RETRY_AFTER_SECS", 1))
+
+# Frame stream mode
+# Face frames averaged before the running face shape can be considered settled
+FACE_STREAM_MIN_FRAMES = int(os.getenv("FACE_STREAM_MIN_FRAMES", 5))
+# Consecutive face frames the running classification must hold to settle and stop early
+FACE_STREAM_STABLE_FRAMES = int(os.getenv("FACE_STREAM_STABLE_FRAMES", 8))
+# Frames processed before a stream gives up on settling
+FACE_STREAM_MAX_FRAMES = int(os.getenv("FACE_STREAM_MAX_FRAMES", 150))
+# Streams open at once, each holds its own tracking FaceMesh, further sockets are closed with 1013
+FACE_STREAM_MAX_STREAMS = int(os.getenv("FACE_STREAM_MAX_STREAMS", FACE_MESH_POOL_SIZE))
+
+# Warm-up
+# Image run through every pooled FaceMesh at startup before the service reports ready
+FACE_WARMUP_IMAGE = os.getenv("FACE_WARMUP_IMAGE", str(Path(__file__).parent / "test1.jpg"))
+
+# Import-time budget for the serving entry points, enforced by check_import_budget.py
+FACE_IMPORT_BUDGET_MS = float(os.getenv("FACE_IMPORT_BUDGET_MS", 1500))
@@ -0,0 +1,142 @@
+"""
+Vectorized face geometry for MediaPipe Face Mesh landmarks
+
+Landmarks are held as float32 pixel-space arrays shaped (N, 3), or (B, N, 3) for a stack of faces,
+and every measurement is computed in one NumPy pass from index tables. Adding a descriptor means
+adding a row to a table, not another per-call computation.
+"""
+
+from itertools import chain
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Face Mesh with refine_landmarks=True yields 468 mesh points plus 10 iris points
+NUM_FACE_LANDMARKS = 478
+
+# Key facial points (using MediaPipe Face Mesh indices)
+# These points help determine face shape
+FACE_POINTS = {
+    'chin': 152,
+    'forehead': 10,
+    'left_cheek': 234,
+    'right_cheek': 454,
+    'left_temple': 447,
+    'right_temple': 227,
+    'left_forehead': 54,
+    'right_forehead': 284,
+    'left_jaw': 172,
+    'right_jaw': 397,
+}
+
+# Distances measured in the image plane between pairs of key points
+DISTANCE_PAIRS = {
+    'face_width': ('left_cheek', 'right_cheek'),
+    'face_height': ('chin', 'forehead'),
+    'jaw_width': ('left_temple', 'right_temple'),
+    'forehead_width': ('left_forehead', 'right_forehead'),
+}
+
+# Angles in degrees at a vertex point, averaged across the face's left and right sides
+ANGLE_TRIPLETS = {
+    # Jaw angle at each gonion, between the ramus (up to the cheek) and the jawline (down to the chin)
+    'jaw_angle': [('left_jaw', 'left_cheek', 'chin'), ('right_jaw', 'right_cheek', 'chin')],
+}
+
+# Ratios between two distances, numerator over denominator
+RATIOS = {
+    'height_width_ratio': ('face_height', 'face_width'),
+    'jaw_face_ratio': ('jaw_width', 'face_width'),
+    'forehead_face_ratio': ('forehead_width', 'face_width'),
+}
+
+_DISTANCE_NAMES = list(DISTANCE_PAIRS)
+_DISTANCE_A = np.array([FACE_POINTS[a] for a, _ in DISTANCE_PAIRS.values()])
+_DISTANCE_B = np.array([FACE_POINTS[b] for _, b in DISTANCE_PAIRS.values()])
+
+_ANGLE_NAMES = list(ANGLE_TRIPLETS)
+_ANGLE_VERTEX, _ANGLE_A, _ANGLE_B = (
+    np.array([[FACE_POINTS[triplet[i]] for triplet in triplets] for triplets in ANGLE_TRIPLETS.values()])
+    for i in range(3)
+)
+
+_RATIO_NAMES = list(RATIOS)
+_RATIO_NUM = np.array([_DISTANCE_NAMES.index(num) for num, _ in RATIOS.values()])
+_RATIO_DEN = np.array([_DISTANCE_NAMES.index(den) for _, den in RATIOS.values()])
+
+
+def landmarks_to_array(
+    face_landmarks,
+    width: int,
+    height: int,
+    out: Optional[np.ndarray] = None,
+    offset_x: float = 0,
+    offset_y: float = 0,
+) -> np.ndarray:
+    """
+    Read a NormalizedLandmarkList into a float32 (N, 3) array of pixel coordinates.
+
+    z is scaled by the image width, matching MediaPipe's convention for landmark depth.
+    width/height/offset describe the region the landmarks were detected in, so landmarks from a
+    cropped frame land back in original image coordinates.
+    Pass out to fill a preallocated array, e.g. one row of a (B, N, 3) batch.
+    """
+    landmark = face_landmarks.landmark
+    num_landmarks = len(landmark)
+    if out is None:
+        out = np.empty((num_landmarks, 3), dtype=np.float32)
+
+    normalized = np.fromiter(
+        chain.from_iterable((lm.x, lm.y, lm.z) for lm in landmark),
+        dtype=np.float32,
+        count=num_landmarks * 3,
+    ).reshape(num_landmarks, 3)
+    np.multiply(normalized, np.array([width, height, width], dtype=np.float32), out=out)
+    if offset_x or offset_y:
+        out[:, :2] += np.array([offset_x, offset_y], dtype=np.float32)
+    return out
+
+
+def stack_landmarks(face_landmarks_list, width: int, height: int) -> np.ndarray:
+    """Read several faces' landmarks into one preallocated float32 (B, N, 3) array."""
+    points = np.empty((len(face_landmarks_list), NUM_FACE_LANDMARKS, 3), dtype=np.float32)
+    for i, face_landmarks in enumerate(face_landmarks_list):
+        landmarks_to_array(face_landmarks, width, height, out=points[i])
+    return points
+
+
+def compute_measurements(points: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute every distance, angle and ratio for (N, 3) or (B, N, 3) landmark points.
+
+    Each returned value has the points' leading batch shape, i.e. a 0-d array for a single face.
+    """
+    xy = points[..., :2]
+
+    distances = np.linalg.norm(xy[..., _DISTANCE_A, :] - xy[..., _DISTANCE_B, :], axis=-1)
+
+    to_a = xy[..., _ANGLE_A, :] - xy[..., _ANGLE_VERTEX, :]
+    to_b = xy[..., _ANGLE_B, :] - xy[..., _ANGLE_VERTEX, :]
+    cosines = np.sum(to_a * to_b, axis=-1) / (np.linalg.norm(to_a, axis=-1) * np.linalg.norm(to_b, axis=-1))
+    angles = np.degrees(np.arccos(np.clip(cosines, -1.0, 1.0))).mean(axis=-1)
+
+    ratios = distances[..., _RATIO_NUM] / distances[..., _RATIO_DEN]
+
+    measurements = {}
+    for values, names in ((distances, _DISTANCE_NAMES), (angles, _ANGLE_NAMES), (ratios, _RATIO_NAMES)):
+        for i, name in enumerate(names):
+            measurements[name] = values[..., i]
+    return measurements
+
+
+def bounding_boxes(points: np.ndarray) -> np.ndarray:
+    """(x, y, width, height) box around the landmarks of each face, shaped (..., 4)"""
+    xy = points[..., :2]
+    top_left = xy.min(axis=-2)
+    bottom_right = xy.max(axis=-2)
+    return np.concatenate([top_left, bottom_right - top_left], axis=-1)
+
+
+def measurements_to_floats(measurements: Dict[str, Any]) -> Dict[str, float]:
+    """Convert single-face measurements to plain floats for JSON/MCP responses."""
+    return {name: float(value) for name, value in measurements.items()}
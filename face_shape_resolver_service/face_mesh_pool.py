@@ -0,0 +1,210 @@
+"""
+Bounded pool of long-lived MediaPipe FaceMesh instances
+
+Building a FaceMesh constructs the MediaPipe graph and loads the model, which costs more than
+running inference on a single image. The pool builds each instance once and hands them out
+exclusively (a FaceMesh is not safe to share between threads), so every worker thread serving
+the MCP tool or HTTP routes reuses a warm model.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Iterator, List, Optional
+
+from config import (
+    FACE_DETECTION_MIN_CONFIDENCE,
+    FACE_MESH_CHECKOUT_TIMEOUT_SECS,
+    FACE_MESH_MIN_DETECTION_CONFIDENCE,
+    FACE_MESH_POOL_SIZE,
+    FACE_MULTI_MAX_FACES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FaceMeshPoolClosedError(RuntimeError):
+    """Raised when checking out from a pool that has been shut down."""
+
+
+def create_face_mesh(static_image_mode: bool = True, max_num_faces: int = 1):
+    # MediaPipe (and the OpenCV it loads) is only imported here, when the first model is built,
+    # so importing the MCP/web entry points stays cheap
+    import mediapipe as mp
+
+    # static_image_mode=False tracks landmarks across video frames instead of re-detecting every frame
+    return mp.solutions.face_mesh.FaceMesh(
+        static_image_mode=static_image_mode,
+        max_num_faces=max_num_faces,
+        refine_landmarks=True,
+        min_detection_confidence=FACE_MESH_MIN_DETECTION_CONFIDENCE,
+    )
+
+
+def create_face_detection():
+    import mediapipe as mp
+
+    # Full range model, client photos aren't always close-up selfies
+    return mp.solutions.face_detection.FaceDetection(
+        model_selection=1,
+        min_detection_confidence=FACE_DETECTION_MIN_CONFIDENCE,
+    )
+
+
+class FaceMeshPool:
+    """
+    Thread-safe, bounded pool of initialized FaceMesh instances.
+
+    Pass factory to pool another MediaPipe solution (e.g. FaceDetection) the same way.
+    """
+
+    def __init__(
+        self,
+        size: int = FACE_MESH_POOL_SIZE,
+        checkout_timeout: float = FACE_MESH_CHECKOUT_TIMEOUT_SECS,
+        factory: Callable[[], Any] = create_face_mesh,
+    ):
+        if size < 1:
+            raise ValueError(f"FaceMesh pool size must be at least 1, got {size}")
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self._factory = factory
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+        self._instances: List[Any] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _create_face_mesh(self):
+        return self._factory()
+
+    def _acquire(self, timeout: Optional[float]):
+        if self._closed:
+            raise FaceMeshPoolClosedError("FaceMesh pool has been shut down")
+
+        # Reuse an idle instance before paying to build a new one
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        # Grow lazily up to the bound so idle cores don't hold models nobody asked for
+        with self._lock:
+            if len(self._instances) < self.size:
+                face_mesh = self._create_face_mesh()
+                self._instances.append(face_mesh)
+                logger.info(f"Initialized FaceMesh {len(self._instances)}/{self.size}")
+                return face_mesh
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No FaceMesh available after waiting {timeout}s")
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Borrow a FaceMesh exclusively for the duration of the with-block."""
+        face_mesh = self._acquire(self.checkout_timeout if timeout is None else timeout)
+        try:
+            yield face_mesh
+        finally:
+            if self._closed:
+                face_mesh.close()
+            else:
+                self._idle.put_nowait(face_mesh)
+
+    def warm(self, warm_up: Optional[Callable[[Any], None]] = None) -> None:
+        """
+        Eagerly build every instance so the first requests don't pay for model setup.
+
+        warm_up, if given, is run on each newly built instance before it's handed out, one instance
+        at a time, so the rest of the pool keeps serving while it runs.
+        """
+        while True:
+            with self._lock:
+                if len(self._instances) >= self.size:
+                    break
+                face_mesh = self._create_face_mesh()
+                self._instances.append(face_mesh)
+            try:
+                if warm_up is not None:
+                    warm_up(face_mesh)
+            finally:
+                self._idle.put_nowait(face_mesh)
+        logger.info(f"FaceMesh pool warmed with {self.size} instances")
+
+    def close(self) -> None:
+        """Release every idle instance; checked-out instances are released when returned."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        logger.info("FaceMesh pool shut down")
+
+
+_pool: Optional[FaceMeshPool] = None
+_detection_pool: Optional[FaceMeshPool] = None
+_multi_face_pool: Optional[FaceMeshPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_face_mesh_pool() -> FaceMeshPool:
+    """Get the process-wide FaceMesh pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = FaceMeshPool()
+    return _pool
+
+
+def get_face_detection_pool() -> FaceMeshPool:
+    """Get the process-wide FaceDetection pool used to find face ROIs, creating it on first use."""
+    global _detection_pool
+    if _detection_pool is None:
+        with _pool_lock:
+            if _detection_pool is None:
+                _detection_pool = FaceMeshPool(factory=create_face_detection)
+    return _detection_pool
+
+
+def get_multi_face_mesh_pool() -> FaceMeshPool:
+    """Get the process-wide pool of FaceMesh instances that find up to FACE_MULTI_MAX_FACES faces."""
+    global _multi_face_pool
+    if _multi_face_pool is None:
+        with _pool_lock:
+            if _multi_face_pool is None:
+                _multi_face_pool = FaceMeshPool(factory=partial(create_face_mesh, max_num_faces=FACE_MULTI_MAX_FACES))
+    return _multi_face_pool
+
+
+def init_face_mesh_pool(size: int, warm: bool = False) -> FaceMeshPool:
+    """Replace the process-wide FaceMesh pool with one of the given size."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        pool = _pool = FaceMeshPool(size=size)
+    if warm:
+        pool.warm()
+    return pool
+
+
+def shutdown_face_mesh_pool() -> None:
+    """Close every process-wide FaceMesh (and FaceDetection) pool that was created."""
+    global _pool, _detection_pool, _multi_face_pool
+    with _pool_lock:
+        for pool in (_pool, _detection_pool, _multi_face_pool):
+            if pool is not None:
+                pool.close()
+        _pool = _detection_pool = _multi_face_pool = None
+
+
+atexit.register(shutdown_face_mesh_pool)
@@ -0,0 +1,149 @@
+"""
+Content-addressed cache for face shape descriptions
+
+Results are keyed by a hash of the decoded image pixels, so the same photo hits the cache whether it
+arrives as a file path, an upload or base64. An in-memory LRU tier answers repeats within a process,
+and an optional on-disk tier of small JSON files survives restarts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from config import FACE_CACHE_DIR, FACE_CACHE_MAX_ENTRIES
+from face_metrics import cache_lookups_total
+
+logger = logging.getLogger(__name__)
+
+
+def image_cache_key(image: np.ndarray, salt: str = "") -> str:
+    """
+    Hash the decoded image's pixels along with its shape so reshaped buffers never collide.
+
+    salt identifies anything else the result depends on, such as preprocessing settings.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{image.shape}|{image.dtype}|{salt}".encode())
+    hasher.update(np.ascontiguousarray(image).data)
+    return hasher.hexdigest()
+
+
+class FaceShapeResultCache:
+    """Thread-safe LRU of face shape results with an optional on-disk tier."""
+
+    def __init__(self, max_entries: int = FACE_CACHE_MAX_ENTRIES, disk_dir: Optional[str] = FACE_CACHE_DIR):
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        # Caller must hold self._lock
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of the cached result for key, or None on a miss."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if result is not None:
+            cache_lookups_total.labels(result="hit").inc()
+            return _copy_result(result)
+
+        if self.disk_dir is not None:
+            try:
+                with open(self._disk_path(key)) as f:
+                    result = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable face shape cache entry {key}: {e}")
+            else:
+                with self._lock:
+                    self._remember(key, result)
+                    self.disk_hits += 1
+                cache_lookups_total.labels(result="disk_hit").inc()
+                return _copy_result(result)
+
+        with self._lock:
+            self.misses += 1
+        cache_lookups_total.labels(result="miss").inc()
+        return None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Cache the face shape and measurements of a result, dropping anything else it carries."""
+        entry = {'face_shape': result['face_shape'], 'measurements': dict(result['measurements'])}
+        with self._lock:
+            self._remember(key, entry)
+
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            try:
+                path.parent.mkdir(exist_ok=True)
+                # Write then rename so a concurrent reader never sees a partial file
+                fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Failed to persist face shape cache entry {key}: {e}")
+
+    def clear(self) -> None:
+        """Drop the in-memory tier and reset counters; the on-disk tier is left intact."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'disk_enabled': self.disk_dir is not None,
+            }
+
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    # Callers add keys to results (e.g. annotations), so never hand out the cached dicts themselves
+    return {'face_shape': result['face_shape'], 'measurements': dict(result['measurements'])}
+
+
+_cache: Optional[FaceShapeResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_face_shape_cache() -> FaceShapeResultCache:
+    """Get the process-wide face shape result cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FaceShapeResultCache()
+    return _cache
@@ -0,0 +1,121 @@
+"""
+Frame stream face shape estimation
+
+A live webcam stream is analyzed with FaceMesh in tracking mode, which only re-runs face detection
+when tracking is lost and is much cheaper per frame than still-image mode. Measurements are averaged
+across frames into a running estimate, and the stream settles (stops early) once the classification
+of that estimate has held steady for enough consecutive frames.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+from config import FACE_MAX_INPUT_EDGE, FACE_STREAM_MAX_FRAMES, FACE_STREAM_MIN_FRAMES, FACE_STREAM_STABLE_FRAMES
+from face_geometry import compute_measurements, landmarks_to_array
+from face_mesh_pool import create_face_mesh
+from image_preprocessing import prepare_image
+from media_pipe_face_shape_descriptor import determine_face_shape
+
+logger = logging.getLogger(__name__)
+
+
+class FaceShapeStream:
+    """
+    Running face shape estimate over a sequence of frames from one camera.
+
+    Owns its own tracking-mode FaceMesh, since tracking state belongs to a single stream and can't
+    be shared through the pool. Frames must be processed one at a time, in order.
+    """
+
+    def __init__(
+        self,
+        min_frames: int = FACE_STREAM_MIN_FRAMES,
+        stable_frames: int = FACE_STREAM_STABLE_FRAMES,
+        max_frames: int = FACE_STREAM_MAX_FRAMES,
+        max_edge: int = FACE_MAX_INPUT_EDGE,
+    ):
+        self.min_frames = min_frames
+        self.stable_frames = stable_frames
+        self.max_frames = max_frames
+        self.max_edge = max_edge
+        self._face_mesh = create_face_mesh(static_image_mode=False)
+        self._names: Optional[list] = None
+        self._sums: Optional[np.ndarray] = None
+        self.frames = 0
+        self.frames_with_face = 0
+        self.face_shape: Optional[str] = None
+        self._stable_count = 0
+
+    @property
+    def settled(self) -> bool:
+        return self.frames_with_face >= self.min_frames and self._stable_count >= self.stable_frames
+
+    @property
+    def exhausted(self) -> bool:
+        return self.frames >= self.max_frames
+
+    def process_frame(self, image_bgr: np.ndarray) -> Dict[str, Any]:
+        """Fold one decoded BGR frame into the running estimate and return the estimate so far."""
+        self.frames += 1
+        prepared = prepare_image(image_bgr, max_edge=self.max_edge, crop_to_face=False)
+        results = self._face_mesh.process(prepared.image_rgb)
+
+        if results.multi_face_landmarks:
+            landmarks = landmarks_to_array(results.multi_face_landmarks[0], prepared.region_width, prepared.region_height)
+            measurements = compute_measurements(landmarks)
+            if self._sums is None:
+                self._names = list(measurements)
+                self._sums = np.zeros(len(self._names), dtype=np.float64)
+            self._sums += np.array([measurements[name] for name in self._names], dtype=np.float64)
+            self.frames_with_face += 1
+
+            mean = self._mean_measurements()
+            face_shape = determine_face_shape(mean['height_width_ratio'], mean['jaw_face_ratio'])
+            self._stable_count = self._stable_count + 1 if face_shape == self.face_shape else 1
+            self.face_shape = face_shape
+
+        return self.estimate()
+
+    def _mean_measurements(self) -> Dict[str, float]:
+        if self._sums is None:
+            return {}
+        return {name: float(total / self.frames_with_face) for name, total in zip(self._names, self._sums)}
+
+    def estimate(self) -> Dict[str, Any]:
+        return {
+            'face_shape': self.face_shape,
+            'measurements': self._mean_measurements(),
+            'frames': self.frames,
+            'frames_with_face': self.frames_with_face,
+            'settled': self.settled,
+        }
+
+    def close(self) -> None:
+        self._face_mesh.close()
+
+    def __enter__(self) -> "FaceShapeStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def describe_face_shape_stream(frames: Iterable[np.ndarray], **stream_kwargs) -> Iterator[Dict[str, Any]]:
+    """
+    Yield a running face shape estimate for each decoded BGR frame.
+
+    Stops consuming frames as soon as the estimate settles or max_frames is reached, the last
+    estimate yielded is the final answer.
+    """
+    with FaceShapeStream(**stream_kwargs) as stream:
+        for frame in frames:
+            estimate = stream.process_frame(frame)
+            yield estimate
+            if stream.settled or stream.exhausted:
+                logger.info(
+                    f"Face shape stream {'settled' if stream.settled else 'gave up'} on {stream.face_shape} "
+                    f"after {stream.frames} frames"
+                )
+                return
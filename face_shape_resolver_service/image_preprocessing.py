@@ -0,0 +1,108 @@
+"""
+Resolution-aware preprocessing ahead of FaceMesh inference
+
+FaceMesh internally works on a small tensor, so color converting and handing it a 12MP phone photo
+is wasted pixel work. Inputs are optionally cropped to the face, downsized to a maximum edge and only
+then color converted. PreparedImage records how to map landmarks back to original pixels so reported
+measurements don't depend on the preprocessing.
+"""
+
+import logging
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from config import FACE_CROP_TO_FACE, FACE_MAX_INPUT_EDGE, FACE_ROI_DETECTION_EDGE, FACE_ROI_MARGIN
+from face_mesh_pool import get_face_detection_pool
+from face_metrics import stage_timer
+
+logger = logging.getLogger(__name__)
+
+# cv2 is imported where used, it's already loaded by the time the FaceMesh pool has a model
+
+
+class PreparedImage(NamedTuple):
+    # Downsized (and possibly cropped) frame, BGR for annotation and RGB for inference
+    image_bgr: np.ndarray
+    image_rgb: np.ndarray
+    # Size in original pixels of the region the prepared frame covers
+    region_width: int
+    region_height: int
+    # Top-left corner of that region in the original image
+    offset_x: int
+    offset_y: int
+
+
+def downsize_to_max_edge(image: np.ndarray, max_edge: int) -> np.ndarray:
+    """Shrink image so its longest edge is at most max_edge, returning it untouched if already small enough"""
+    import cv2
+
+    height, width = image.shape[:2]
+    longest_edge = max(height, width)
+    if max_edge <= 0 or longest_edge <= max_edge:
+        return image
+    scale = max_edge / longest_edge
+    return cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))), interpolation=cv2.INTER_AREA)
+
+
+def detect_face_roi(image_bgr: np.ndarray, margin: float = FACE_ROI_MARGIN) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Find the most confident face with a FaceDetection pass over a small thumbnail.
+
+    Returns the face box grown by margin on each side as (x, y, width, height) in original pixels,
+    or None if no face was found.
+    """
+    import cv2
+
+    height, width = image_bgr.shape[:2]
+    thumbnail_rgb = cv2.cvtColor(downsize_to_max_edge(image_bgr, FACE_ROI_DETECTION_EDGE), cv2.COLOR_BGR2RGB)
+
+    with get_face_detection_pool().checkout() as face_detection, stage_timer("roi_detection"):
+        results = face_detection.process(thumbnail_rgb)
+
+    if not results.detections:
+        return None
+
+    detection = max(results.detections, key=lambda d: d.score[0])
+    box = detection.location_data.relative_bounding_box
+    x0 = max(0.0, box.xmin - box.width * margin)
+    y0 = max(0.0, box.ymin - box.height * margin)
+    x1 = min(1.0, box.xmin + box.width * (1 + margin))
+    y1 = min(1.0, box.ymin + box.height * (1 + margin))
+    if x1 <= x0 or y1 <= y0:
+        return None
+
+    left, top = int(x0 * width), int(y0 * height)
+    return left, top, int(x1 * width) - left, int(y1 * height) - top
+
+
+def prepare_image(
+    image_bgr: np.ndarray,
+    max_edge: int = FACE_MAX_INPUT_EDGE,
+    crop_to_face: bool = FACE_CROP_TO_FACE,
+) -> PreparedImage:
+    """Crop (optionally), downsize and color convert a decoded BGR image for FaceMesh"""
+    import cv2
+
+    height, width = image_bgr.shape[:2]
+    offset_x, offset_y, region_width, region_height = 0, 0, width, height
+
+    if crop_to_face:
+        roi = detect_face_roi(image_bgr)
+        if roi is None:
+            logger.info("No face ROI detected, running FaceMesh on the full frame")
+        else:
+            offset_x, offset_y, region_width, region_height = roi
+            # Slicing is a view, no pixels are copied until the resize below
+            image_bgr = image_bgr[offset_y:offset_y + region_height, offset_x:offset_x + region_width]
+
+    with stage_timer("resize"):
+        image_bgr = downsize_to_max_edge(image_bgr, max_edge)
+    with stage_timer("color_conversion"):
+        image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
+    return PreparedImage(image_bgr, image_rgb, region_width, region_height, offset_x, offset_y)
+
+
+def preprocessing_signature(max_edge: int = FACE_MAX_INPUT_EDGE, crop_to_face: bool = FACE_CROP_TO_FACE) -> str:
+    """Identify the preprocessing settings, so cached results are only reused under the same settings"""
+    return f"max_edge={max_edge}|crop_to_face={crop_to_face}"
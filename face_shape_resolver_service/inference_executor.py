@@ -0,0 +1,91 @@
+"""
+Bounded executor that keeps blocking face inference off the event loop
+
+Inference runs on a fixed set of worker threads (matching the FaceMesh pool). Admission is capped at
+the worker count plus a short queue; anything past that is rejected right away so callers can back
+off, instead of piling up requests that would time out anyway.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from config import FACE_HTTP_MAX_CONCURRENCY, FACE_HTTP_MAX_QUEUE
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceQueueFullError(RuntimeError):
+    """Raised when the executor is already holding as much work as it admits."""
+
+
+class BoundedInferenceExecutor:
+    """Thread executor with a hard cap on running plus queued work."""
+
+    def __init__(self, max_concurrency: int = FACE_HTTP_MAX_CONCURRENCY, max_queue: int = FACE_HTTP_MAX_QUEUE):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="face-inference")
+        self._admitted = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.max_concurrency + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._admitted
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._admitted -= 1
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on a worker thread, or raise InferenceQueueFullError if saturated."""
+        with self._lock:
+            if self._admitted >= self.capacity:
+                raise InferenceQueueFullError(f"{self._admitted} inference requests already in flight")
+            self._admitted += 1
+
+        try:
+            future = self._executor.submit(partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release(None)
+            raise
+        # Free the slot when the work actually finishes, even if the awaiting request is cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_executor: Optional[BoundedInferenceExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_inference_executor() -> BoundedInferenceExecutor:
+    """Get the process-wide inference executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BoundedInferenceExecutor()
+                logger.info(
+                    f"Inference executor started with {_executor.max_concurrency} workers "
+                    f"and room for {_executor.max_queue} queued requests"
+                )
+    return _executor
+
+
+def shutdown_inference_executor() -> None:
+    """Stop the inference executor's worker threads if it was started."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
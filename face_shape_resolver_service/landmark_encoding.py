@@ -0,0 +1,68 @@
+"""
+Compact binary encoding of face landmarks
+
+Raw landmark geometry (e.g. for overlay rendering) is 478x3 floats per face, which JSON turns into
+several times the bytes and parse time of the underlying buffer. A payload is a fixed little-endian
+header followed by the float32 (faces, points, dims) array in C order:
+
+    offset  size  field
+    0       4     magic b"FLMK"
+    4       2     format version (uint16)
+    6       2     faces (uint16)
+    8       2     points per face (uint16)
+    10      2     dims per point (uint16), x/y/z
+    12      4     image width in pixels (uint32)
+    16      4     image height in pixels (uint32)
+    20      ...   faces * points * dims float32 values
+
+Coordinates are pixels in the original image, with z scaled by image width as MediaPipe does.
+"""
+
+import struct
+from typing import NamedTuple
+
+import numpy as np
+
+LANDMARKS_MEDIA_TYPE = "application/octet-stream"
+LANDMARKS_MAGIC = b"FLMK"
+LANDMARKS_FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHHHII")
+_DTYPE = np.dtype("<f4")
+
+
+class DecodedLandmarks(NamedTuple):
+    # float32 (faces, points, dims) pixel coordinates
+    points: np.ndarray
+    image_width: int
+    image_height: int
+
+
+def encode_landmarks(points: np.ndarray, image_width: int, image_height: int) -> bytes:
+    """Pack (N, 3) or (B, N, 3) landmark points into the binary landmark format"""
+    if points.ndim == 2:
+        points = points[np.newaxis]
+    if points.ndim != 3:
+        raise ValueError(f"Expected (N, 3) or (B, N, 3) landmarks, got shape {points.shape}")
+    faces, num_points, dims = points.shape
+    header = _HEADER.pack(LANDMARKS_MAGIC, LANDMARKS_FORMAT_VERSION, faces, num_points, dims, image_width, image_height)
+    # No copy when points are already contiguous little-endian float32, as landmarks_to_array produces
+    return header + np.ascontiguousarray(points, dtype=_DTYPE).tobytes()
+
+
+def decode_landmarks(payload: bytes) -> DecodedLandmarks:
+    """Unpack a binary landmark payload, the points array is a read-only view over payload"""
+    if len(payload) < _HEADER.size:
+        raise ValueError(f"Landmark payload too short for header: {len(payload)} bytes")
+    magic, version, faces, num_points, dims, image_width, image_height = _HEADER.unpack_from(payload)
+    if magic != LANDMARKS_MAGIC:
+        raise ValueError(f"Not a landmark payload, bad magic: {magic!r}")
+    if version != LANDMARKS_FORMAT_VERSION:
+        raise ValueError(f"Unsupported landmark format version: {version}")
+
+    count = faces * num_points * dims
+    expected_size = _HEADER.size + count * _DTYPE.itemsize
+    if len(payload) != expected_size:
+        raise ValueError(f"Landmark payload is {len(payload)} bytes, expected {expected_size}")
+    points = np.frombuffer(payload, dtype=_DTYPE, count=count, offset=_HEADER.size)
+    return DecodedLandmarks(points.reshape(faces, num_points, dims), image_width, image_height)
@@ -1,49 +1,63 @@
-from web_server import app
+import argparse
+import uvicorn
+from web_server import create_app
 from mcp_server import mcp as face_descriptor_mcp
-import sys
 
 
-def start_web_server():
-    print("\n🌐 Starting web server...")
-    print("Server running on: http://localhost:8001")
+def start_server(host: str, port: int, mount_mcp: bool):
+    print("\n🌐 Starting server...")
+    print(f"Server running on: http://localhost:{port}")
+    if mount_mcp:
+        print(f"MCP endpoint: http://localhost:{port}/mcp")
     print("=" * 50)
 
     try:
         uvicorn.run(
-            app,
-            host="0.0.0.0",
-            port=8001,
+            create_app(mount_mcp=mount_mcp),
+            host=host,
+            port=port,
         )
     except KeyboardInterrupt:
         print("\n🍻 Thanks for using Face Descriptor Service! Cheers!")
 
 
-def start_mcp_server():
+def start_mcp_server(host: str, port: int):
     print("\n🌐 Starting MCP server...")
     print("Server running!!")
     print("=" * 50)
 
     face_descriptor_mcp.run(
         transport="http",
-        host="0.0.0.0",
-        port=8001,
+        host=host,
+        port=port,
         path="/mcp",
         log_level="debug",
     )
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Face Descriptor Service")
+    parser.add_argument(
+        "--transport",
+        choices=["all", "web", "mcp"],
+        default="all",
+        help="all: HTTP routes and MCP at /mcp from one process (default), web: HTTP routes only, mcp: MCP only",
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8001)
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    import uvicorn
-    
+    args = parse_args()
+
     print("🍷 Starting Face Descriptor Service!!")
     print("=" * 50)
 
-    server_protocol = sys.argv[1] if (len(sys.argv) == 2 and sys.argv[0] == "main.py") else input("Would you like to start this service as either:\n1. HTTP Web Server\n2. MCP Tool Service\n????\n")
-
-    match server_protocol:
-        case "1" | "web" | "Web":
-            start_web_server()
-        case "2" | "mcp" | "MCP":
-            start_mcp_server()
-        case _:
-            print("Unknown server protocol type selected.")
+    match args.transport:
+        case "all":
+            start_server(args.host, args.port, mount_mcp=True)
+        case "web":
+            start_server(args.host, args.port, mount_mcp=False)
+        case "mcp":
+            start_mcp_server(args.host, args.port)
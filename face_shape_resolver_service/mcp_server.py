@@ -1,5 +1,19 @@
+from typing import Literal, Optional
 from fastmcp import FastMCP
-from media_pipe_face_shape_descriptor import describe_face_shape_localhost_mcp_tool
+from fastmcp.exceptions import ToolError
+from config import FACE_HTTP_RETRY_AFTER_SECS
+from face_metrics import rejected_requests_total
+from inference_executor import InferenceQueueFullError, get_inference_executor
+from media_pipe_face_shape_descriptor import (
+    decode_base64_image,
+    describe_face_shape_from_bytes,
+    describe_face_shape_localhost_mcp_tool,
+    describe_group_face_shapes,
+    decode_image_bytes,
+    encode_result_for_transport,
+    resolve_localhost_image_path,
+)
+from batch_face_shape_descriptor import describe_face_shapes
 
 """
 FastMCP Tool Service for Face Descriptions
@@ -10,6 +24,56 @@ mcp = FastMCP(
     instructions="Use this Face Descriptor tool when there is an image of a hair client's face whose shape needs to be described.",
 )
 
+
+async def run_tool_inference(fn, *args, **kwargs):
+    """Run blocking inference on the bounded executor, the MCP counterpart of web_server.run_inference."""
+    try:
+        return await get_inference_executor().run(fn, *args, **kwargs)
+    except InferenceQueueFullError:
+        rejected_requests_total.inc()
+        raise ToolError(f"Face inference queue is full, retry in {FACE_HTTP_RETRY_AFTER_SECS} seconds")
+
+
+@mcp.tool()
+async def describe_face_shape_tool(
+    image_path: str,
+    annotation_format: Optional[Literal["jpeg", "png"]] = None,
+    include_landmarks: bool = False,
+):
+    """
+    Describe the face shape of an image. Only pass annotation_format when an annotated image is actually needed,
+    and include_landmarks only when raw face geometry is needed (returned base64 encoded in the binary landmark format).
+    """
+    return await run_tool_inference(
+        describe_face_shape_localhost_mcp_tool, image_path, annotation_format=annotation_format, include_landmarks=include_landmarks
+    )
+
+
+@mcp.tool()
+async def describe_face_shape_base64_tool(
+    image_base64: str,
+    annotation_format: Optional[Literal["jpeg", "png"]] = None,
+    include_landmarks: bool = False,
+):
+    """Describe the face shape of a base64 encoded image (or image data URL) sent inline, no shared filesystem needed."""
+    image_bytes = decode_base64_image(image_base64)
+    result = await run_tool_inference(
+        describe_face_shape_from_bytes, image_bytes, annotation_format=annotation_format, include_landmarks=include_landmarks
+    )
+    return encode_result_for_transport(result)
+
+
+@mcp.tool()
+async def describe_face_shapes_tool(image_paths: list[str]):
+    """Describe the face shapes of many images at once, results are returned in input order with per-image errors."""
+    # The batch fans out to worker processes, it only holds one executor slot while it waits
+    return await run_tool_inference(
+        describe_face_shapes, [resolve_localhost_image_path(image_path) for image_path in image_paths]
+    )
+
+
 @mcp.tool()
-def describe_face_shape_tool(image_path: str):
-    return describe_face_shape_localhost_mcp_tool(image_path)
+async def describe_group_face_shapes_tool(image_base64: str):
+    """Describe every face in a group photo (base64 encoded image or data URL) in one pass, each with its bounding box."""
+    image_bytes = decode_base64_image(image_base64)
+    return await run_tool_inference(lambda: describe_group_face_shapes(decode_image_bytes(image_bytes)))
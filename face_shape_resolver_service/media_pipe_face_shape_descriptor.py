@@ -1,14 +1,34 @@
 #!/usr/bin/env python3
 
-import mediapipe as mp
-import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 from pathlib import Path
+from typing import Optional
+import base64
+import binascii
 import os
+from face_mesh_pool import get_face_mesh_pool, get_multi_face_mesh_pool
+from face_shape_cache import get_face_shape_cache, image_cache_key
+from face_geometry import (
+    FACE_POINTS,
+    bounding_boxes,
+    compute_measurements,
+    landmarks_to_array,
+    measurements_to_floats,
+    stack_landmarks,
+)
+from image_preprocessing import prepare_image, preprocessing_signature
+from face_metrics import no_face_total, stage_timer
+from landmark_encoding import encode_landmarks
+from config import FACE_ANNOTATION_JPEG_QUALITY, FACE_CROP_TO_FACE, FACE_MAX_INPUT_EDGE
 
+# cv2 and mediapipe are imported inside the functions that use them. They're first loaded when the
+# FaceMesh pool builds its models, so importing this module on the serving path stays cheap.
 
-def describe_face_shape_localhost_mcp_tool(image_key: str):
+# Supported annotation encodings
+ANNOTATION_FORMATS = ('jpeg', 'png')
+
+
+def describe_face_shape_localhost_mcp_tool(image_key: str, annotation_format: Optional[str] = None, include_landmarks: bool = False):
     """
     For localhost demo purposes, the flow is simplified by:
     1. hackily downloading client face image in browser
@@ -16,101 +36,237 @@ def describe_face_shape_localhost_mcp_tool(image_key: str):
     3. prefixing image key with absolute path to Downloads folder
     4. validate that image path exists
     4. describing the face
+
+    A requested annotation or landmark payload is returned base64 encoded so it can travel in the MCP JSON response
     """
-    downloads_path = str(Path.home() / "Downloads")
-    full_path = os.path.join(downloads_path, image_key)
+    full_path = resolve_localhost_image_path(image_key)
 
     if os.path.exists(full_path):
         print(f"Found image at: {full_path}")
-        return describe_face_shape(full_path)
+        return encode_result_for_transport(
+            describe_face_shape(full_path, annotation_format=annotation_format, include_landmarks=include_landmarks)
+        )
     else:
         print(f"No image found at: {full_path}")
         return None
 
 
-def describe_face_shape(image_path: str):
-    mp_face_mesh = mp.solutions.face_mesh
-    mp_drawing = mp.solutions.drawing_utils
+def encode_result_for_transport(result):
+    """Base64 encode a requested annotation or landmark payload so the result can travel in a JSON/MCP response"""
+    if result is not None:
+        for field in ('annotated_image', 'landmarks'):
+            if field in result:
+                result[field] = base64.b64encode(result[field]).decode('ascii')
+    return result
+
+
+def resolve_localhost_image_path(image_key: str) -> str:
+    """Prefix a browser-downloaded image key with the absolute path to the Downloads folder"""
+    downloads_path = str(Path.home() / "Downloads")
+    return os.path.join(downloads_path, image_key)
+
+
+def describe_face_shape(image_path: str, annotation_format: Optional[str] = None, include_landmarks: bool = False):
+    """
+    Describe the face shape of the image at image_path.
+
+    Annotation is opt-in: pass annotation_format ("jpeg" or "png") to also get the face mesh
+    drawn over the image, returned as compressed bytes under 'annotated_image'.
+    Likewise include_landmarks adds the raw landmarks under 'landmarks', see landmark_encoding.
+    """
+    import cv2
 
     # Read image
-    image = cv2.imread(image_path)
-    # Convert BGR to RGB
-    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    height, width = image.shape[:2]
-
-    # Initialize Face Mesh
-    with mp_face_mesh.FaceMesh(
-        static_image_mode=True,
-        max_num_faces=1,
-        refine_landmarks=True,
-        min_detection_confidence=0.5
-    ) as face_mesh:
-        
-        # Process the image
-        results = face_mesh.process(image_rgb)
-        
-        # Check if face detected
-        if not results.multi_face_landmarks:
-            print("No face detected!")
-            return
-        
-        # Get the first face's landmarks
-        face_landmarks = results.multi_face_landmarks[0]
-        
-        # Create a copy for visualization
-        annotated_image = image_rgb.copy()
-        
-        # Draw the landmarks / face mesh
-        mp_drawing.draw_landmarks(
-            image=annotated_image,
-            landmark_list=face_landmarks,
-            connections=mp_face_mesh.FACEMESH_TESSELATION,
-            landmark_drawing_spec=mp_drawing.DrawingSpec(color=(0,255,0), thickness=1, circle_radius=1),
-            connection_drawing_spec=mp_drawing.DrawingSpec(color=(255,0,0), thickness=1)
+    with stage_timer("decode"):
+        image = cv2.imread(image_path)
+    if image is None:
+        raise ValueError(f"Could not read image at: {image_path}")
+    return describe_face_image(image, annotation_format=annotation_format, include_landmarks=include_landmarks)
+
+
+def describe_face_shape_from_bytes(image_bytes: bytes, annotation_format: Optional[str] = None, include_landmarks: bool = False):
+    """Describe the face shape of an encoded (JPEG/PNG/...) image held in memory, never touching disk"""
+    return describe_face_image(
+        decode_image_bytes(image_bytes),
+        annotation_format=annotation_format,
+        include_landmarks=include_landmarks,
+    )
+
+
+def decode_image_bytes(image_bytes: bytes) -> np.ndarray:
+    """Decode an encoded (JPEG/PNG/...) image straight from its buffer into a BGR array"""
+    import cv2
+
+    if not image_bytes:
+        raise ValueError("Image payload is empty")
+    with stage_timer("decode"):
+        try:
+            image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        except cv2.error as e:
+            raise ValueError(f"Could not decode image bytes: {e}")
+    if image is None:
+        raise ValueError("Could not decode image bytes")
+    return image
+
+
+def decode_base64_image(image_base64: str) -> bytes:
+    """Decode a base64 image payload, accepting browser data URLs such as 'data:image/jpeg;base64,...'"""
+    if image_base64.startswith("data:"):
+        image_base64 = image_base64.split(",", 1)[-1]
+    try:
+        return base64.b64decode(image_base64, validate=True)
+    except binascii.Error as e:
+        raise ValueError(f"Invalid base64 image payload: {e}")
+
+
+def describe_face_image(
+    image: np.ndarray,
+    annotation_format: Optional[str] = None,
+    use_cache: bool = True,
+    max_edge: int = FACE_MAX_INPUT_EDGE,
+    crop_to_face: bool = FACE_CROP_TO_FACE,
+    include_landmarks: bool = False,
+):
+    """
+    Describe the face shape of a decoded BGR image.
+
+    Large images are downsized to max_edge (and optionally cropped to the face) before inference,
+    measurements are still reported in original image pixels.
+    Repeat analyses of the same pixels are answered from the result cache. Annotations and the
+    binary landmark payload need the landmarks, so they always run inference. Annotations are drawn
+    over the preprocessed frame.
+    """
+    if annotation_format is not None and annotation_format not in ANNOTATION_FORMATS:
+        raise ValueError(f"Unsupported annotation format: {annotation_format}")
+
+    cache = get_face_shape_cache() if use_cache else None
+    cache_key = image_cache_key(image, salt=preprocessing_signature(max_edge, crop_to_face)) if cache is not None else None
+    if cache is not None and annotation_format is None and not include_landmarks:
+        cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+
+    # Downsize (and crop) before color conversion so we only convert pixels the model will use
+    prepared = prepare_image(image, max_edge=max_edge, crop_to_face=crop_to_face)
+
+    # Check out a warm Face Mesh from the shared pool, holding it only for inference
+    with get_face_mesh_pool().checkout() as face_mesh, stage_timer("inference"):
+        results = face_mesh.process(prepared.image_rgb)
+
+    # Check if face detected
+    if not results.multi_face_landmarks:
+        no_face_total.inc()
+        print("No face detected!")
+        return
+    
+    # Get the first face's landmarks
+    face_landmarks = results.multi_face_landmarks[0]
+
+    # Extract key measurements in one vectorized pass over the landmarks, mapped back to original pixels
+    with stage_timer("landmarks"):
+        landmarks = landmarks_to_array(
+            face_landmarks,
+            prepared.region_width,
+            prepared.region_height,
+            offset_x=prepared.offset_x,
+            offset_y=prepared.offset_y,
         )
+    with stage_timer("measurements"):
+        measurements = measurements_to_floats(compute_measurements(landmarks))
+
+    # Determine face shape
+    with stage_timer("classify"):
+        face_shape = determine_face_shape(measurements['height_width_ratio'], measurements['jaw_face_ratio'])
+
+    result = {
+        'face_shape': face_shape,
+        'measurements': measurements,
+    }
+    if cache is not None:
+        cache.put(cache_key, result)
+    if include_landmarks:
+        result['landmarks'] = encode_landmarks(landmarks, image.shape[1], image.shape[0])
+    if annotation_format is not None:
+        annotation_frame = prepared.image_bgr
+        # Without a resize the frame is the caller's image (or a crop view of it), don't draw on it
+        if np.may_share_memory(annotation_frame, image):
+            annotation_frame = annotation_frame.copy()
+        with stage_timer("annotation"):
+            result['annotated_image'] = render_annotation(annotation_frame, face_landmarks, annotation_format)
+    return result
+
+
+def describe_group_face_shapes(image: np.ndarray, max_edge: int = FACE_MAX_INPUT_EDGE):
+    """
+    Describe every face in a decoded BGR group photo with a single FaceMesh inference pass.
+
+    All faces' landmarks are stacked into one (B, N, 3) array so their geometry is computed together.
+    Faces are returned left to right, each with a bounding box in original image pixels.
+    """
+    prepared = prepare_image(image, max_edge=max_edge, crop_to_face=False)
+
+    with get_multi_face_mesh_pool().checkout() as face_mesh, stage_timer("inference"):
+        results = face_mesh.process(prepared.image_rgb)
+
+    if not results.multi_face_landmarks:
+        no_face_total.inc()
+        return {'faces': []}
 
-        # Extract key measurements
-        landmarks = np.array([(lm.x * width, lm.y * height) for lm in face_landmarks.landmark])
-        
-        # Key facial points (using MediaPipe Face Mesh indices)
-        # These points help determine face shape
-        FACE_POINTS = {
-            'chin': 152,
-            'forehead': 10,
-            'left_cheek': 234,
-            'right_cheek': 454,
-            'left_temple': 447,
-            'right_temple': 227
-        }
-
-        # Calculate face measurements
-        face_width = np.linalg.norm(landmarks[FACE_POINTS['left_cheek']] - landmarks[FACE_POINTS['right_cheek']])
-        face_height = np.linalg.norm(landmarks[FACE_POINTS['chin']] - landmarks[FACE_POINTS['forehead']])
-        jaw_width = np.linalg.norm(landmarks[FACE_POINTS['left_temple']] - landmarks[FACE_POINTS['right_temple']])
-        
-        # Calculate ratios
-        height_width_ratio = face_height / face_width
-        jaw_face_ratio = jaw_width / face_width
-
-        # Determine face shape
-        face_shape = determine_face_shape(height_width_ratio, jaw_face_ratio)
-
-        # Visualize key points
-        for point_name, point_idx in FACE_POINTS.items():
-            cv2.circle(annotated_image, 
-                      (int(landmarks[point_idx][0]), int(landmarks[point_idx][1])), 
-                      5, (0, 255, 0), -1)
-
-        return {
-            'face_shape': face_shape,
-            'measurements': {
-                'height_width_ratio': height_width_ratio,
-                'jaw_face_ratio': jaw_face_ratio,
-                'face_width': face_width,
-                'face_height': face_height
-            },
-            'annotated_image': annotated_image
-        }        
+    with stage_timer("landmarks"):
+        points = stack_landmarks(results.multi_face_landmarks, prepared.region_width, prepared.region_height)
+    with stage_timer("measurements"):
+        measurements = compute_measurements(points)
+        boxes = bounding_boxes(points)
+
+    faces = []
+    for i in np.argsort(boxes[:, 0]):
+        face_measurements = measurements_to_floats({name: values[i] for name, values in measurements.items()})
+        x, y, box_width, box_height = (float(v) for v in boxes[i])
+        faces.append({
+            'face_shape': determine_face_shape(face_measurements['height_width_ratio'], face_measurements['jaw_face_ratio']),
+            'measurements': face_measurements,
+            'bounding_box': {'x': x, 'y': y, 'width': box_width, 'height': box_height},
+        })
+    return {'faces': faces}
+
+
+def render_annotation(image_bgr: np.ndarray, face_landmarks, annotation_format: str) -> bytes:
+    """
+    Draw the face mesh and key points onto image_bgr and encode it as JPEG/PNG bytes.
+
+    image_bgr is drawn on in place, so pass a frame that isn't needed afterwards.
+    """
+    import cv2
+    import mediapipe as mp
+
+    mp_face_mesh = mp.solutions.face_mesh
+    mp_drawing = mp.solutions.drawing_utils
+    height, width = image_bgr.shape[:2]
+
+    # Draw the landmarks / face mesh (colors are BGR)
+    mp_drawing.draw_landmarks(
+        image=image_bgr,
+        landmark_list=face_landmarks,
+        connections=mp_face_mesh.FACEMESH_TESSELATION,
+        landmark_drawing_spec=mp_drawing.DrawingSpec(color=(0,255,0), thickness=1, circle_radius=1),
+        connection_drawing_spec=mp_drawing.DrawingSpec(color=(0,0,255), thickness=1)
+    )
+
+    # Visualize key points
+    for point_idx in FACE_POINTS.values():
+        landmark = face_landmarks.landmark[point_idx]
+        cv2.circle(image_bgr,
+                  (int(landmark.x * width), int(landmark.y * height)),
+                  5, (0, 255, 0), -1)
+
+    if annotation_format == 'jpeg':
+        extension, params = '.jpg', [cv2.IMWRITE_JPEG_QUALITY, FACE_ANNOTATION_JPEG_QUALITY]
+    else:
+        extension, params = '.png', [cv2.IMWRITE_PNG_COMPRESSION, 3]
+    ok, encoded = cv2.imencode(extension, image_bgr, params)
+    if not ok:
+        raise RuntimeError(f"Failed to encode annotated image as {annotation_format}")
+    return encoded.tobytes()
 
 
 def determine_face_shape(height_width_ratio, jaw_face_ratio):
@@ -132,8 +288,13 @@ def determine_face_shape(height_width_ratio, jaw_face_ratio):
 
 def display_results(result):
     """Display the original image with annotations and measurements"""
+    # Only the local demo plots, keep matplotlib off the serving path entirely
+    import cv2
+    import matplotlib.pyplot as plt
+
+    annotated_image = cv2.imdecode(np.frombuffer(result['annotated_image'], dtype=np.uint8), cv2.IMREAD_COLOR)
     plt.figure(figsize=(12, 8))
-    plt.imshow(result['annotated_image'])
+    plt.imshow(cv2.cvtColor(annotated_image, cv2.COLOR_BGR2RGB))
     plt.title(f"Detected Face Shape: {result['face_shape']}")
     plt.axis('off')
     
@@ -155,7 +316,7 @@ def main():
         # "test2.jpg",
         "test3.jpg",
     ]:        
-        result = describe_face_shape(image_path)
+        result = describe_face_shape(image_path, annotation_format="png")
         if isinstance(result, str):
             print(result)  # Print error message if face not detected
         else:
@@ -0,0 +1,76 @@
+"""
+Model warm-up and readiness state for the Face Descriptor service
+
+The first inference on a FaceMesh pays for graph initialization on top of model loading. Warm-up
+builds every instance of each pool the routes use and runs the bundled image through each one before
+the service reports ready, so the first real requests after a deploy or scale-out don't land on cold
+models.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config import FACE_CROP_TO_FACE, FACE_WARMUP_IMAGE
+from face_mesh_pool import get_face_detection_pool, get_face_mesh_pool, get_multi_face_mesh_pool
+from image_preprocessing import prepare_image
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceReadiness:
+    """Tracks whether warm-up has finished, how long it took and whether it failed."""
+
+    def __init__(self):
+        self._ready = threading.Event()
+        self.started_at: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def warm_up(self) -> None:
+        """Build every pooled FaceMesh (and FaceDetection) and run one inference through each, then mark the service ready."""
+        self.started_at = time.perf_counter()
+        try:
+            # Imported here rather than at module level, the entry points import this module
+            import cv2
+
+            image = cv2.imread(FACE_WARMUP_IMAGE)
+            if image is None:
+                raise ValueError(f"Could not read warm-up image at: {FACE_WARMUP_IMAGE}")
+            image_rgb = prepare_image(image, crop_to_face=False).image_rgb
+            pools = [get_face_mesh_pool(), get_multi_face_mesh_pool()]
+            if FACE_CROP_TO_FACE:
+                pools.append(get_face_detection_pool())
+            # Each instance runs its first (slow) inference here before it's handed out, one at a time
+            for pool in pools:
+                pool.warm(lambda model: model.process(image_rgb))
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            logger.error(f"Face service warm-up failed: {self.error}")
+            return
+
+        self.warmup_seconds = time.perf_counter() - self.started_at
+        self._ready.set()
+        logger.info(
+            f"Face service warmed {sum(pool.size for pool in pools)} models across {len(pools)} pools "
+            f"in {self.warmup_seconds:.2f}s"
+        )
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "warming_up": self.started_at is not None and not self.ready and self.error is None,
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.error,
+        }
+
+
+readiness = ServiceReadiness()
@@ -0,0 +1,94 @@
+import math
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from face_geometry import (
+    FACE_POINTS,
+    NUM_FACE_LANDMARKS,
+    bounding_boxes,
+    compute_measurements,
+    landmarks_to_array,
+    measurements_to_floats,
+    stack_landmarks,
+)
+
+WIDTH, HEIGHT = 640, 480
+
+
+def make_face_landmarks(seed: int):
+    """A fixed, face-sized spread of normalized landmarks shaped like a NormalizedLandmarkList."""
+    rng = np.random.default_rng(seed)
+    points = rng.uniform([0.25, 0.15, -0.1], [0.75, 0.85, 0.1], size=(NUM_FACE_LANDMARKS, 3))
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in points])
+
+
+def scalar_measurements(face_landmarks, width: int, height: int) -> dict:
+    """The measurements as computed one landmark pair at a time before they were vectorized."""
+    landmarks = np.array([(lm.x * width, lm.y * height) for lm in face_landmarks.landmark])
+
+    def distance(a: str, b: str) -> float:
+        return float(np.linalg.norm(landmarks[FACE_POINTS[a]] - landmarks[FACE_POINTS[b]]))
+
+    def angle(vertex: str, a: str, b: str) -> float:
+        to_a = landmarks[FACE_POINTS[a]] - landmarks[FACE_POINTS[vertex]]
+        to_b = landmarks[FACE_POINTS[b]] - landmarks[FACE_POINTS[vertex]]
+        cosine = np.dot(to_a, to_b) / (np.linalg.norm(to_a) * np.linalg.norm(to_b))
+        return math.degrees(math.acos(max(-1.0, min(1.0, cosine))))
+
+    face_width = distance('left_cheek', 'right_cheek')
+    face_height = distance('chin', 'forehead')
+    jaw_width = distance('left_temple', 'right_temple')
+    forehead_width = distance('left_forehead', 'right_forehead')
+    return {
+        'face_width': face_width,
+        'face_height': face_height,
+        'jaw_width': jaw_width,
+        'forehead_width': forehead_width,
+        'jaw_angle': (angle('left_jaw', 'left_cheek', 'chin') + angle('right_jaw', 'right_cheek', 'chin')) / 2,
+        'height_width_ratio': face_height / face_width,
+        'jaw_face_ratio': jaw_width / face_width,
+        'forehead_face_ratio': forehead_width / face_width,
+    }
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_vectorized_measurements_match_scalar_implementation(seed):
+    face_landmarks = make_face_landmarks(seed)
+    expected = scalar_measurements(face_landmarks, WIDTH, HEIGHT)
+
+    measurements = measurements_to_floats(compute_measurements(landmarks_to_array(face_landmarks, WIDTH, HEIGHT)))
+
+    assert measurements.keys() == expected.keys()
+    for name, value in expected.items():
+        assert measurements[name] == pytest.approx(value, rel=1e-5), name
+
+
+def test_landmarks_to_array_scales_to_pixels_and_applies_offset():
+    face_landmarks = make_face_landmarks(0)
+    points = landmarks_to_array(face_landmarks, WIDTH, HEIGHT, offset_x=10, offset_y=20)
+
+    first = face_landmarks.landmark[0]
+    assert points.dtype == np.float32
+    assert points.shape == (NUM_FACE_LANDMARKS, 3)
+    np.testing.assert_allclose(points[0], [first.x * WIDTH + 10, first.y * HEIGHT + 20, first.z * WIDTH], rtol=1e-6)
+
+
+def test_stacked_faces_match_single_faces():
+    faces = [make_face_landmarks(seed) for seed in range(3)]
+    batch = compute_measurements(stack_landmarks(faces, WIDTH, HEIGHT))
+
+    for i, face_landmarks in enumerate(faces):
+        single = compute_measurements(landmarks_to_array(face_landmarks, WIDTH, HEIGHT))
+        for name, value in single.items():
+            assert batch[name][i] == pytest.approx(float(value), rel=1e-6), name
+
+
+def test_bounding_boxes_cover_every_landmark():
+    points = landmarks_to_array(make_face_landmarks(0), WIDTH, HEIGHT)
+    x, y, width, height = bounding_boxes(points)
+
+    assert x == points[:, 0].min()
+    assert y == points[:, 1].min()
+    assert x + width == pytest.approx(points[:, 0].max())
+    assert y + height == pytest.approx(points[:, 1].max())
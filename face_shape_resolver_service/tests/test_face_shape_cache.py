@@ -0,0 +1,86 @@
+import numpy as np
+from face_shape_cache import FaceShapeResultCache, image_cache_key
+
+RESULT = {'face_shape': "Oval", 'measurements': {'height_width_ratio': 1.4, 'jaw_face_ratio': 0.8}}
+
+
+def make_result(face_shape: str = "Oval") -> dict:
+    return {'face_shape': face_shape, 'measurements': dict(RESULT['measurements'])}
+
+
+def test_miss_then_hit():
+    cache = FaceShapeResultCache(max_entries=4, disk_dir=None)
+    assert cache.get("a") is None
+    cache.put("a", make_result())
+    assert cache.get("a") == RESULT
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_put_drops_everything_but_shape_and_measurements():
+    cache = FaceShapeResultCache(max_entries=4, disk_dir=None)
+    cache.put("a", {**make_result(), 'annotated_image': b"jpeg bytes", 'landmarks': b"payload"})
+    assert cache.get("a") == RESULT
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = FaceShapeResultCache(max_entries=2, disk_dir=None)
+    cache.put("a", make_result("Oval"))
+    cache.put("b", make_result("Round"))
+    cache.get("a")
+    cache.put("c", make_result("Square"))
+    assert cache.get("b") is None
+    assert cache.get("a")['face_shape'] == "Oval"
+    assert cache.get("c")['face_shape'] == "Square"
+    assert cache.stats()['entries'] == 2
+
+
+def test_returned_results_do_not_alias_the_cached_entry():
+    cache = FaceShapeResultCache(max_entries=4, disk_dir=None)
+    stored = make_result()
+    cache.put("a", stored)
+    stored['measurements']['jaw_face_ratio'] = 0.1
+
+    first = cache.get("a")
+    first['annotated_image'] = "base64"
+    first['measurements']['jaw_face_ratio'] = 0.2
+    assert cache.get("a") == RESULT
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    FaceShapeResultCache(max_entries=4, disk_dir=str(tmp_path)).put("ab12", make_result())
+
+    cache = FaceShapeResultCache(max_entries=4, disk_dir=str(tmp_path))
+    assert cache.get("ab12") == RESULT
+    assert cache.get("ab12") == RESULT
+    assert cache.stats()['disk_hits'] == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_unreadable_disk_entry_is_a_miss(tmp_path):
+    cache = FaceShapeResultCache(max_entries=4, disk_dir=str(tmp_path))
+    path = tmp_path / "ab" / "ab12.json"
+    path.parent.mkdir()
+    path.write_text("{not json")
+    assert cache.get("ab12") is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_clear_keeps_the_disk_tier(tmp_path):
+    cache = FaceShapeResultCache(max_entries=4, disk_dir=str(tmp_path))
+    cache.put("ab12", make_result())
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+    assert cache.get("ab12") == RESULT
+
+
+def test_image_cache_key_depends_on_pixels_shape_and_salt():
+    image = np.zeros((4, 6, 3), dtype=np.uint8)
+    key = image_cache_key(image)
+    assert image_cache_key(image.copy()) == key
+    assert image_cache_key(image.reshape(6, 4, 3)) != key
+    assert image_cache_key(image, salt="max_edge=640") != key
+
+    changed = image.copy()
+    changed[0, 0, 0] = 1
+    assert image_cache_key(changed) != key
@@ -0,0 +1,56 @@
+import struct
+
+import numpy as np
+import pytest
+from landmark_encoding import LANDMARKS_FORMAT_VERSION, LANDMARKS_MAGIC, decode_landmarks, encode_landmarks
+
+
+def make_points(*shape: int) -> np.ndarray:
+    return np.random.default_rng(0).uniform(-50, 700, size=shape).astype(np.float32)
+
+
+def test_single_face_round_trip():
+    points = make_points(478, 3)
+    decoded = decode_landmarks(encode_landmarks(points, 640, 480))
+
+    assert decoded.points.shape == (1, 478, 3)
+    np.testing.assert_array_equal(decoded.points[0], points)
+    assert (decoded.image_width, decoded.image_height) == (640, 480)
+
+
+def test_multi_face_round_trip():
+    points = make_points(3, 478, 3)
+    decoded = decode_landmarks(encode_landmarks(points, 1920, 1080))
+    np.testing.assert_array_equal(decoded.points, points)
+
+
+def test_float64_points_are_encoded_as_float32():
+    points = make_points(478, 3).astype(np.float64)
+    payload = encode_landmarks(points, 640, 480)
+
+    assert len(payload) == 20 + 478 * 3 * 4
+    np.testing.assert_array_equal(decode_landmarks(payload).points[0], points.astype(np.float32))
+
+
+def test_decoded_points_are_a_read_only_view():
+    decoded = decode_landmarks(encode_landmarks(make_points(478, 3), 640, 480))
+    with pytest.raises(ValueError):
+        decoded.points[0, 0, 0] = 1
+
+
+def test_encode_rejects_wrong_shape():
+    with pytest.raises(ValueError):
+        encode_landmarks(make_points(478), 640, 480)
+
+
+@pytest.mark.parametrize("payload", [
+    b"",
+    b"FLMK",
+    b"NOPE" + encode_landmarks(make_points(478, 3), 640, 480)[4:],
+    struct.pack("<4sHHHHII", LANDMARKS_MAGIC, LANDMARKS_FORMAT_VERSION + 1, 1, 478, 3, 640, 480),
+    encode_landmarks(make_points(478, 3), 640, 480)[:-4],
+    encode_landmarks(make_points(478, 3), 640, 480) + b"\0\0\0\0",
+], ids=["empty", "header_truncated", "bad_magic", "bad_version", "points_truncated", "trailing_bytes"])
+def test_decode_rejects_malformed_payloads(payload):
+    with pytest.raises(ValueError):
+        decode_landmarks(payload)
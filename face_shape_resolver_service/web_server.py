@@ -2,31 +2,339 @@
 FastAPI HTTP Web Server for Face Descriptor service
 """
 
+import asyncio
 import logging
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Literal, Optional
+from fastapi import APIRouter, FastAPI, File, Form, HTTPException, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from pydantic import BaseModel, Field
+from face_mesh_pool import get_face_mesh_pool, shutdown_face_mesh_pool
+from face_shape_cache import get_face_shape_cache
+from inference_executor import InferenceQueueFullError, get_inference_executor, shutdown_inference_executor
+from config import FACE_HTTP_RETRY_AFTER_SECS, FACE_STREAM_MAX_STREAMS
+from batch_face_shape_descriptor import describe_face_shapes, shutdown_batch_executor
+from mcp_server import mcp as face_descriptor_mcp
+from face_shape_stream import FaceShapeStream
+from service_readiness import readiness
+from face_metrics import rejected_requests_total, render_metrics
+from landmark_encoding import LANDMARKS_MEDIA_TYPE
+from media_pipe_face_shape_descriptor import (
+    decode_base64_image,
+    decode_image_bytes,
+    describe_face_shape,
+    describe_face_shape_from_bytes,
+    describe_group_face_shapes,
+    encode_result_for_transport,
+    resolve_localhost_image_path,
+)
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(name)s | %(message)s")
 logger = logging.getLogger(__name__)
 
-# Create FastAPI app
-app = FastAPI(
-    title="Face descriptor API",
-    description="A service that takes in an image path input and describes the face shape with Google MediaPipe",
-    version="1.0.0",
-)
+@asynccontextmanager
+async def service_lifespan():
+    # Requests check out FaceMesh instances from the shared pool, release them all on shutdown
+    pool = get_face_mesh_pool()
+    logger.info(f"FaceMesh pool ready with up to {pool.size} instances")
+    get_inference_executor()
+    # Warm models in the background so the server binds (and answers liveness) right away
+    warmup_task = asyncio.create_task(asyncio.to_thread(readiness.warm_up))
+    try:
+        yield
+    finally:
+        await warmup_task
+        shutdown_inference_executor()
+        shutdown_batch_executor()
+        shutdown_face_mesh_pool()
 
-# Add CORS middleware for development
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-        "http://localhost:5173",  # Vite dev server
-        "http://127.0.0.1:5173",
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+
+def create_app(mount_mcp: bool = True) -> FastAPI:
+    """
+    Create the service app, serving the HTTP routes and (by default) the MCP transport at /mcp.
+
+    Both transports run in this one process, so they share a single FaceMesh pool and result cache.
+    """
+    mcp_app = face_descriptor_mcp.http_app(path="/mcp") if mount_mcp else None
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with service_lifespan():
+            if mcp_app is None:
+                yield
+            else:
+                # The MCP session manager only runs inside its app's lifespan
+                async with mcp_app.lifespan(app):
+                    yield
+
+    # Create FastAPI app
+    app = FastAPI(
+        lifespan=lifespan,
+        title="Face descriptor API",
+        description="A service that takes in an image path input and describes the face shape with Google MediaPipe",
+        version="1.0.0",
+    )
+
+    # Add CORS middleware for development
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://localhost:3000",
+            "http://127.0.0.1:3000",
+            "http://localhost:5173",  # Vite dev server
+            "http://127.0.0.1:5173",
+        ],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    app.include_router(router)
+    if mcp_app is not None:
+        # Mounted last so every HTTP route above takes precedence over the catch-all mount
+        app.mount("/", mcp_app)
+    return app
+
+
+router = APIRouter()
+
+
+# Pydantic models
+AnnotationFormat = Literal["jpeg", "png"]
+
+
+class DescribeFaceRequest(BaseModel):
+    img_path: str = Field(alias="imgPath")
+    annotation_format: Optional[AnnotationFormat] = Field(default=None, alias="annotationFormat")
+
+
+class DescribeFaceBase64Request(BaseModel):
+    image_base64: str = Field(alias="imageBase64")
+    annotation_format: Optional[AnnotationFormat] = Field(default=None, alias="annotationFormat")
+
+
+class DescribeFaceResponse(BaseModel):
+    face_shape: str
+    measurements: Dict[str, float]
+    annotated_image: Optional[str] = None
+
+
+class BoundingBox(BaseModel):
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+class GroupFace(BaseModel):
+    face_shape: str
+    measurements: Dict[str, float]
+    bounding_box: BoundingBox
+
+
+class DescribeGroupFacesResponse(BaseModel):
+    faces: List[GroupFace]
+
+
+class DescribeFacesRequest(BaseModel):
+    img_paths: List[str] = Field(alias="imgPaths")
+
+
+class DescribeFacesEntry(BaseModel):
+    image: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class DescribeFacesResponse(BaseModel):
+    results: List[DescribeFacesEntry]
+
+
+async def run_inference(fn, *args, **kwargs):
+    """Run blocking inference on the bounded executor, shedding load with 503 when it's saturated."""
+    try:
+        return await get_inference_executor().run(fn, *args, **kwargs)
+    except InferenceQueueFullError as e:
+        logger.warning(f"Rejecting face inference request: {e}")
+        rejected_requests_total.inc()
+        raise HTTPException(
+            status_code=503,
+            detail="Face inference queue is full, retry shortly",
+            headers={"Retry-After": str(FACE_HTTP_RETRY_AFTER_SECS)},
+        )
+
+
+def to_describe_face_response(result) -> DescribeFaceResponse:
+    if result is None:
+        raise HTTPException(status_code=422, detail="No face detected")
+    return DescribeFaceResponse(**encode_result_for_transport(result))
+
+
+async def describe_image_bytes(image_bytes: bytes, annotation_format: Optional[str]) -> DescribeFaceResponse:
+    try:
+        result = await run_inference(describe_face_shape_from_bytes, image_bytes, annotation_format=annotation_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return to_describe_face_response(result)
+
+
+# API Routes
+@router.post("/api/describe-face", response_model=DescribeFaceResponse)
+async def describe_face(request: DescribeFaceRequest):
+    """Describe the face shape of a browser-downloaded image key."""
+    image_path = resolve_localhost_image_path(request.img_path)
+    if not os.path.exists(image_path):
+        raise HTTPException(status_code=404, detail=f"No image found for: {request.img_path}")
+    try:
+        result = await run_inference(describe_face_shape, image_path, annotation_format=request.annotation_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return to_describe_face_response(result)
+
+
+@router.post("/api/describe-face/upload", response_model=DescribeFaceResponse)
+async def describe_face_upload(
+    image: UploadFile = File(...),
+    annotation_format: Optional[AnnotationFormat] = Form(default=None, alias="annotationFormat"),
+):
+    """Describe the face shape of a multipart uploaded image, decoded straight from memory."""
+    return await describe_image_bytes(await image.read(), annotation_format)
+
+
+@router.post("/api/describe-face/base64", response_model=DescribeFaceResponse)
+async def describe_face_base64(request: DescribeFaceBase64Request):
+    """Describe the face shape of a base64 encoded image (or image data URL)."""
+    try:
+        image_bytes = decode_base64_image(request.image_base64)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await describe_image_bytes(image_bytes, request.annotation_format)
+
+
+@router.post("/api/describe-face/landmarks", response_class=Response)
+async def describe_face_landmarks(image: UploadFile = File(...)):
+    """
+    Return the raw landmarks of a multipart uploaded image in the binary landmark format (see
+    landmark_encoding.decode_landmarks), with the face shape in the X-Face-Shape header.
+    """
+    image_bytes = await image.read()
+    try:
+        result = await run_inference(describe_face_shape_from_bytes, image_bytes, include_landmarks=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=422, detail="No face detected")
+    return Response(content=result['landmarks'], media_type=LANDMARKS_MEDIA_TYPE, headers={"X-Face-Shape": result['face_shape']})
+
+
+@router.post("/api/describe-face/group", response_model=DescribeGroupFacesResponse)
+async def describe_face_group(image: UploadFile = File(...)):
+    """Describe every face in a multipart uploaded group photo in a single inference pass."""
+    image_bytes = await image.read()
+    try:
+        result = await run_inference(lambda: describe_group_face_shapes(decode_image_bytes(image_bytes)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return DescribeGroupFacesResponse(**result)
+
+
+@router.post("/api/describe-faces", response_model=DescribeFacesResponse)
+async def describe_faces(request: DescribeFacesRequest):
+    """Describe the face shapes of a batch of images across the worker process pool."""
+    image_paths = [resolve_localhost_image_path(img_path) for img_path in request.img_paths]
+    try:
+        # The batch fans out to worker processes, it only holds one executor slot while it waits
+        entries = await run_inference(describe_face_shapes, image_paths)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    # Report results against the keys the caller sent rather than resolved local paths
+    for entry, img_path in zip(entries, request.img_paths):
+        entry["image"] = img_path
+    return DescribeFacesResponse(results=entries)
+
+
+# Caps the tracking FaceMeshes held by open streams, which live outside the pool
+stream_slots = asyncio.Semaphore(FACE_STREAM_MAX_STREAMS)
+
+
+def process_encoded_frame(stream: FaceShapeStream, frame_bytes: bytes) -> Dict[str, Any]:
+    return stream.process_frame(decode_image_bytes(frame_bytes))
+
+
+@router.websocket("/ws/describe-face-stream")
+async def describe_face_stream(websocket: WebSocket):
+    """
+    Stream webcam frames (binary JPEG/PNG messages, or base64 text) and receive a running face shape
+    estimate after each one. The server closes the socket once the estimate settles.
+    """
+    await websocket.accept()
+    if stream_slots.locked():
+        rejected_requests_total.inc()
+        # 1013: Try Again Later
+        await websocket.close(code=1013, reason="Too many face streams open, retry shortly")
+        return
+
+    executor = get_inference_executor()
+    stream = None
+    await stream_slots.acquire()
+    try:
+        stream = await executor.run(FaceShapeStream)
+        while not (stream.settled or stream.exhausted):
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            try:
+                frame_bytes = message.get("bytes") or decode_base64_image(message.get("text") or "")
+                # Frames go through the same bounded executor as every other inference request
+                estimate = await executor.run(process_encoded_frame, stream, frame_bytes)
+            except InferenceQueueFullError:
+                raise
+            except Exception as e:
+                # One bad frame (empty, corrupt, not an image) shouldn't end the whole stream
+                logger.warning(f"Skipping unusable stream frame: {e!r}")
+                await websocket.send_json({"error": str(e)})
+                continue
+            await websocket.send_json(estimate)
+        await websocket.close()
+    except InferenceQueueFullError:
+        rejected_requests_total.inc()
+        # 1013: Try Again Later
+        await websocket.close(code=1013, reason="Face inference queue is full, retry shortly")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if stream is not None:
+            stream.close()
+        stream_slots.release()
+
+
+@router.get("/health")
+async def health_check():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "alive", "version": "1.0.0"}
+
+
+@router.get("/ready")
+async def readiness_check():
+    """Readiness: every pooled FaceMesh is loaded and warmed. 503 until warm-up finishes."""
+    return JSONResponse(readiness.status(), status_code=200 if readiness.ready else 503)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Per-stage latency histograms and no-face/cache/rejection counters in Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+@router.get("/api/cache-stats")
+async def cache_stats():
+    """Hit/miss counts of the face shape result cache."""
+    return get_face_shape_cache().stats()
+
+
+app = create_app()
@@ -1,11 +1,13 @@
 export interface ChatMessage {
   message: string;
+  session_id?: string;
 }
 
 export interface ChatResponse {
   response: string;
   success: boolean;
   error?: string;
+  session_id?: string;
 }
 
 // Determine API base URL based on environment
@@ -14,6 +16,9 @@ const API_BASE_URL = import.meta.env.DEV
   : ''; // Use relative URLs in production (served by same Python server)
 
 class ApiService {
+  // Server-issued chat sessions per endpoint, so follow-up messages continue the same conversation
+  private sessionIds: Record<string, string | undefined> = {};
+
   private async request<T>(
     endpoint: string,
     options: RequestInit = {}
@@ -43,24 +48,35 @@ class ApiService {
   }
 
   async chat(message: string): Promise<ChatResponse> {
-    return this.request<ChatResponse>('/api/chat', {
+    const response = await this.request<ChatResponse>('/api/chat', {
       method: 'POST',
-      body: JSON.stringify({ message }),
+      body: JSON.stringify({ message, session_id: this.sessionIds.chat }),
     });
+    this.sessionIds.chat = response.session_id ?? this.sessionIds.chat;
+    return response;
+  }
+
+  chatStream(message: string): AsyncGenerator<string, void, unknown> {
+    return this.streamChat('/api/chat/stream', message);
+  }
+
+  chatStreamAppointmentsTemp(message: string): AsyncGenerator<string, void, unknown> {
+    return this.streamChat('/api/appointments/chat/stream', message);
   }
 
-  async *chatStream(message: string): AsyncGenerator<string, void, unknown> {
-    const response = await fetch(`${API_BASE_URL}/api/chat/stream`, {
+  private async *streamChat(endpoint: string, message: string): AsyncGenerator<string, void, unknown> {
+    const response = await fetch(`${API_BASE_URL}${endpoint}`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
       },
-      body: JSON.stringify({ message }),
+      body: JSON.stringify({ message, session_id: this.sessionIds[endpoint] }),
     });
 
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);
     }
+    this.sessionIds[endpoint] = response.headers.get('X-Session-Id') ?? this.sessionIds[endpoint];
 
     const reader = response.body?.getReader();
     if (!reader) {
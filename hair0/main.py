@@ -43,6 +43,8 @@ if __name__ == "__main__":
     print("Server running on: http://localhost:8000")
     print("API docs: http://localhost:8000/docs")
     print("Health check: http://localhost:8000/health")
+    print("Readiness check: http://localhost:8000/ready")
+    print("Metrics: http://localhost:8000/metrics")
     print("=" * 50)
     
     try:
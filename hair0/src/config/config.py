@@ -52,3 +52,50 @@ BEVERAGE_CATEGORIES = ["beer", "wine", "spirits", "cocktails"]
 # Rating scale
 MIN_RATING = 1
 MAX_RATING = 5
+
+# Face shape descriptor service
+FACE_SERVICE_URL = os.getenv("FACE_SERVICE_URL", "http://localhost:8001")
+FACE_SERVICE_MCP_URL = f"{FACE_SERVICE_URL}/mcp"
+FACE_SERVICE_READY_URL = f"{FACE_SERVICE_URL}/ready"
+# How long agent creation waits for the face service to finish warming up
+FACE_SERVICE_READY_TIMEOUT_SECS = float(os.getenv("FACE_SERVICE_READY_TIMEOUT_SECS", 30))
+FACE_SERVICE_READY_POLL_SECS = 0.5
+
+# Chat agent sessions
+# Most sessions (each an agent with its own conversation history) kept live at once
+AGENT_MAX_SESSIONS = int(os.getenv("AGENT_MAX_SESSIONS", 100))
+# Seconds a session may sit idle before it is evicted
+AGENT_SESSION_TTL_SECS = float(os.getenv("AGENT_SESSION_TTL_SECS", 30 * 60))
+# Agent turns running at once across all sessions, each holds a worker thread
+AGENT_MAX_CONCURRENT_TURNS = int(os.getenv("AGENT_MAX_CONCURRENT_TURNS", 8))
+# Seconds a chat turn may take, including the wait for a free worker
+AGENT_TURN_TIMEOUT_SECS = float(os.getenv("AGENT_TURN_TIMEOUT_SECS", 120))
+# Seconds between health check pings on the shared face service MCP session
+MCP_HEALTH_CHECK_INTERVAL_SECS = float(os.getenv("MCP_HEALTH_CHECK_INTERVAL_SECS", 15))
+MCP_PING_TIMEOUT_SECS = 5
+# Reconnect backoff doubles from the base up to the max after each failed attempt
+MCP_RECONNECT_BACKOFF_SECS = 1
+MCP_RECONNECT_BACKOFF_MAX_SECS = 60
+
+# Chat streaming
+# Text deltas are coalesced into one SSE frame until it's this many characters or seconds old
+SSE_FLUSH_MAX_CHARS = int(os.getenv("SSE_FLUSH_MAX_CHARS", 256))
+SSE_FLUSH_INTERVAL_SECS = float(os.getenv("SSE_FLUSH_INTERVAL_SECS", 0.05))
+# Seconds of silence before a heartbeat comment is sent to keep the connection open
+SSE_HEARTBEAT_SECS = float(os.getenv("SSE_HEARTBEAT_SECS", 15))
+# Seconds between MCP tool rediscoveries, which pick up tools from servers that were down at startup
+MCP_TOOL_DISCOVERY_INTERVAL_SECS = float(os.getenv("MCP_TOOL_DISCOVERY_INTERVAL_SECS", 60))
+
+# Appointment fast path
+# Seconds the Square catalog is reused by the intent router before it's fetched again
+APPOINTMENT_CATALOG_TTL_SECS = float(os.getenv("APPOINTMENT_CATALOG_TTL_SECS", 60))
+
+# Conversation history
+# Estimated tokens of history an agent carries into each prompt before its older turns are compacted
+AGENT_HISTORY_MAX_TOKENS = int(os.getenv("AGENT_HISTORY_MAX_TOKENS", 8000))
+# Most recent turns that are always kept verbatim
+AGENT_HISTORY_KEEP_RECENT_TURNS = int(os.getenv("AGENT_HISTORY_KEEP_RECENT_TURNS", 2))
+# Tool results from older turns longer than this many characters are replaced with a short summary
+AGENT_HISTORY_TOOL_RESULT_MAX_CHARS = int(os.getenv("AGENT_HISTORY_TOOL_RESULT_MAX_CHARS", 400))
+# Characters the rolling summary of compacted turns may grow to, its oldest lines are dropped past this
+AGENT_HISTORY_SUMMARY_MAX_CHARS = int(os.getenv("AGENT_HISTORY_SUMMARY_MAX_CHARS", 2000))
@@ -0,0 +1,129 @@
+"""
+Session-scoped Agent Pool
+
+Each chat session gets its own agent, and with it its own conversation history, created on demand.
+Tools are built once by the caller and shared by every agent the pool creates. The pool caps how
+many sessions are live at once, evicting sessions idle past their TTL and then the least recently
+used idle session when a new one needs room.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from strands import Agent
+from src.config.config import AGENT_MAX_SESSIONS, AGENT_SESSION_TTL_SECS
+from src.core.turn_tracing import instrument_tools
+
+logger = logging.getLogger(__name__)
+
+
+class SessionLimitError(Exception):
+    """Every session slot is held by a session with a turn in progress."""
+
+
+@dataclass
+class AgentSession:
+    session_id: str
+    agent: Agent
+    last_used: float = field(default_factory=time.monotonic)
+    # One turn at a time per session, an agent's history can't take interleaved turns
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Requests holding the session from checkout until release, e.g. a stream that hasn't started its turn yet
+    checkouts: int = 0
+
+    @property
+    def busy(self) -> bool:
+        return self.checkouts > 0 or self.lock.locked()
+
+
+class AgentSessionPool:
+    def __init__(
+        self,
+        agent_factory: Callable[[], Agent],
+        max_sessions: int = AGENT_MAX_SESSIONS,
+        idle_ttl_secs: float = AGENT_SESSION_TTL_SECS,
+    ):
+        self.agent_factory = agent_factory
+        self.max_sessions = max_sessions
+        self.idle_ttl_secs = idle_ttl_secs
+        # Least recently used first
+        self._sessions: "OrderedDict[str, AgentSession]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get_or_create(self, session_id: Optional[str] = None) -> AgentSession:
+        """
+        Get the session for session_id, creating it (under a new id when none is given) if it doesn't
+        exist or has been evicted. Raises SessionLimitError if no session slot can be freed.
+        """
+        now = time.monotonic()
+        self._evict_expired(now)
+
+        session = self._sessions.get(session_id) if session_id else None
+        if session is not None:
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+        if len(self._sessions) >= self.max_sessions:
+            self._evict_least_recently_used()
+
+        session = AgentSession(session_id=session_id or uuid.uuid4().hex, agent=self.agent_factory(), last_used=now)
+        self._sessions[session.session_id] = session
+        logger.info(f"Created agent session {session.session_id} ({len(self._sessions)}/{self.max_sessions} live)")
+        return session
+
+    def checkout(self, session_id: Optional[str] = None) -> AgentSession:
+        """
+        Get or create the session like get_or_create, holding it against eviction until release is
+        called. Every checkout must be paired with exactly one release.
+        """
+        session = self.get_or_create(session_id)
+        session.checkouts += 1
+        return session
+
+    def release(self, session: AgentSession) -> None:
+        """Give back a checked out session, restarting its idle clock."""
+        session.checkouts -= 1
+        self.touch(session)
+
+    def touch(self, session: AgentSession) -> None:
+        """Restart the session's idle clock, e.g. once a long turn finishes."""
+        session.last_used = time.monotonic()
+
+    def _evict_expired(self, now: float) -> None:
+        expired = [
+            session_id for session_id, session in self._sessions.items()
+            if not session.busy and now - session.last_used > self.idle_ttl_secs
+        ]
+        for session_id in expired:
+            del self._sessions[session_id]
+        if expired:
+            logger.info(f"Evicted {len(expired)} idle agent sessions")
+
+    def _evict_least_recently_used(self) -> None:
+        for session_id, session in self._sessions.items():
+            if not session.busy:
+                del self._sessions[session_id]
+                logger.info(f"Evicted least recently used agent session {session_id}")
+                return
+        raise SessionLimitError(f"All {self.max_sessions} agent sessions have a turn in progress")
+
+    def add_tools(self, tools: List[Any]) -> None:
+        """Give every live session's agent newly discovered tools, agents created later get them from the factory."""
+        tools = instrument_tools(tools)
+        for session in self._sessions.values():
+            for tool in tools:
+                session.agent.tool_registry.register_tool(tool)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "live_sessions": len(self._sessions),
+            "busy_sessions": sum(session.busy for session in self._sessions.values()),
+            "max_sessions": self.max_sessions,
+        }
@@ -0,0 +1,140 @@
+"""
+Bounded executor that keeps agent turns off the event loop
+
+A turn is several blocking model and tool round-trips (the Bedrock client is synchronous even under
+the agent's async API), so turns run on a fixed set of worker threads, each with its own event loop.
+The worker count caps concurrent turns, and each turn has a timeout that includes time spent waiting
+for a worker. A session stays locked until its turn really finishes, even after the request gave up
+on it, so a late turn can't interleave with the session's next one.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
+from strands.agent.agent_result import AgentResult
+from src.config.config import AGENT_MAX_CONCURRENT_TURNS, AGENT_TURN_TIMEOUT_SECS
+from src.core.agent_session_pool import AgentSession
+from src.core.turn_metrics import turn_timeouts_total
+from src.core.turn_tracing import trace_turn
+
+logger = logging.getLogger(__name__)
+
+_STREAM_END = object()
+
+T = TypeVar("T")
+
+
+class AgentTurnTimeoutError(TimeoutError):
+    """Raised when an agent turn (including its wait for a worker) runs past the turn timeout."""
+
+
+class AgentTurnExecutor:
+    def __init__(self, max_concurrent_turns: int = AGENT_MAX_CONCURRENT_TURNS, turn_timeout_secs: float = AGENT_TURN_TIMEOUT_SECS):
+        self.max_concurrent_turns = max_concurrent_turns
+        self.turn_timeout_secs = turn_timeout_secs
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_turns, thread_name_prefix="agent-turn")
+
+    async def _submit(self, session: AgentSession, fn, *args) -> Future:
+        """Lock the session and start fn on a worker, unlocking the session once fn is done."""
+        try:
+            await asyncio.wait_for(session.lock.acquire(), self.turn_timeout_secs)
+        except asyncio.TimeoutError:
+            raise AgentTurnTimeoutError(f"Session {session.session_id} was still busy after {self.turn_timeout_secs}s")
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            session.lock.release()
+            raise
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(session.lock.release))
+        return future
+
+    async def run(self, session: AgentSession, prompt: str) -> AgentResult:
+        """Run one turn of the session's agent on a worker thread and return its result."""
+        return await self.call(session, _run_turn, session.agent, session.session_id, prompt)
+
+    async def call(self, session: AgentSession, fn: Callable[..., T], *args) -> T:
+        """Run fn(*args) on a worker thread while holding the session, e.g. work that reads or edits its history."""
+        future = await self._submit(session, fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.turn_timeout_secs)
+        except asyncio.TimeoutError:
+            logger.warning(f"Agent turn for session {session.session_id} timed out after {self.turn_timeout_secs}s")
+            turn_timeouts_total.labels(agent=session.agent.name).inc()
+            raise AgentTurnTimeoutError(f"Agent turn timed out after {self.turn_timeout_secs}s")
+
+    async def stream(self, session: AgentSession, prompt: str) -> AsyncIterator[Any]:
+        """Run one turn of the session's agent on a worker thread, yielding its stream events as they arrive."""
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def publish(event: Any) -> None:
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        future = await self._submit(session, _run_turn, session.agent, session.session_id, prompt, publish)
+        future.add_done_callback(lambda _: publish(_STREAM_END))
+
+        deadline = loop.time() + self.turn_timeout_secs
+        while True:
+            try:
+                event = await asyncio.wait_for(events.get(), max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                logger.warning(f"Agent stream for session {session.session_id} timed out after {self.turn_timeout_secs}s")
+                turn_timeouts_total.labels(agent=session.agent.name).inc()
+                future.cancel()
+                raise AgentTurnTimeoutError(f"Agent turn timed out after {self.turn_timeout_secs}s")
+            if event is _STREAM_END:
+                break
+            yield event
+        # Surface an exception raised by the turn
+        future.result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_turn(agent, session_id: str, prompt: str, publish: Optional[Callable[[Any], None]] = None) -> AgentResult:
+    """Run one traced turn on the calling worker thread, passing each stream event to publish if given."""
+    async def turn() -> AgentResult:
+        result = None
+        # Entered inside the turn's event loop so the agent's spans nest under the turn's
+        with trace_turn(agent.name, session_id) as turn_trace:
+            async for event in agent.stream_async(prompt):
+                if "data" in event:
+                    turn_trace.first_token()
+                elif "result" in event:
+                    result = event["result"]
+                if publish is not None:
+                    publish(event)
+        return result
+
+    return asyncio.run(turn())
+
+
+_executor: Optional[AgentTurnExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_agent_turn_executor() -> AgentTurnExecutor:
+    """Get the process-wide agent turn executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = AgentTurnExecutor()
+                logger.info(
+                    f"Agent turn executor started with {_executor.max_concurrent_turns} workers "
+                    f"and a {_executor.turn_timeout_secs}s turn timeout"
+                )
+    return _executor
+
+
+def shutdown_agent_turn_executor() -> None:
+    """Stop the agent turn executor's worker threads if it was started."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
@@ -1,15 +1,23 @@
 import logging
 from typing import Any, List
 from strands import Agent
+from src.core.history_compaction import CompactingConversationManager
+from src.core.turn_tracing import InstrumentedBedrockModel, instrument_tools
 
 logger = logging.getLogger(__name__)
 
+CLAUDE_MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
 
 def create_strands_claude_agent(agent_name: str, system_prompt: str, tools: List[Any]) -> Agent:
     agent = Agent(
-        model="us.anthropic.claude-3-7-sonnet-20250219-v1:0",
+        name=agent_name,
+        # Model and tool calls are timed for the turn breakdown on /metrics
+        model=InstrumentedBedrockModel(agent_name, model_id=CLAUDE_MODEL_ID),
         system_prompt=system_prompt,
-        tools=tools,
+        tools=instrument_tools(tools),
+        # Caps the history resent with every turn, compacting older turns once it's over budget
+        conversation_manager=CompactingConversationManager(),
         callback_handler=None
     )
     logger.info(f"{agent_name} created successfully!!")
@@ -0,0 +1,150 @@
+"""
+Intent Router for the Hair Service Appointment Booking Agent
+
+The most common appointment questions ("what services do you offer?", "any openings for a Fade?")
+have deterministic answers. The router answers them straight from Square, in the same format the
+agent's system prompt asks for, and leaves everything else (booking in particular) to the agent.
+Answered exchanges are written into the agent's history so follow-ups still have their context.
+"""
+
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from strands import Agent
+from src.config.config import APPOINTMENT_CATALOG_TTL_SECS
+from src.core.appointment_tools import appointments_dao
+from src.core.turn_tracing import traced_call
+from src.services.square_appointments_dao import CatalogResponse, HairService
+
+logger = logging.getLogger(__name__)
+
+# Anything that changes a booking always goes to the agent
+BOOKING_PATTERN = re.compile(r"\b(book|booking|reserve|cancel|reschedule|confirm)\b", re.IGNORECASE)
+# So does anything asking for advice or details about a service, even when it names the catalog
+AGENT_QUESTION_PATTERN = re.compile(
+    r"\b(recommend\w*|suggest\w*|differen(?:ce|t)|compare|comparison|vs|versus|questions?|does|do(?:es)?n't|includ\w*)\b",
+    re.IGNORECASE,
+)
+# Only explicit requests for the whole catalog are answered directly
+CATALOG_LISTING_PATTERN = re.compile(
+    r"\b(?:list|show)(?: me)?(?: all)?(?: of)? your (?:services|menu|prices)\b"
+    r"|\bwhat services do you (?:offer|have)\b"
+    r"|\b(?:menu|price list)\b",
+    re.IGNORECASE,
+)
+SLOTS_PATTERN = re.compile(
+    r"\b(slots?|availability|openings?|(?:open|free|available) (?:times?|spots?)|times? (?:are )?available|when\b.*\bavailable)\b",
+    re.IGNORECASE,
+)
+# A specific day or time needs the agent, which can pass its own window to get_available_slots
+DATE_TIME_PATTERN = re.compile(
+    r"\d|\b(?:mon|tues|wednes|thurs|fri|satur|sun)day\b|\b(?:mon|tue|wed|thu|fri|sat|sun)\b"
+    r"|\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?"
+    r"|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b"
+    r"|\b(?:today|tonight|tomorrow|next|this|weekend|morning|afternoon|evening|noon|midday|after|before|until)\b"
+    r"|\b[ap]\.?m\b",
+    re.IGNORECASE,
+)
+
+# Days of open slots listed, matching the DAO's default window
+SLOT_LOOKAHEAD_DAYS = 5
+
+_catalog: Optional[CatalogResponse] = None
+_catalog_expires_at = 0.0
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> CatalogResponse:
+    """The Square catalog, reused for APPOINTMENT_CATALOG_TTL_SECS between fetches."""
+    global _catalog, _catalog_expires_at
+    with _catalog_lock:
+        if _catalog is None or time.monotonic() >= _catalog_expires_at:
+            with traced_call("square", "catalog.list"):
+                catalog = appointments_dao.list_catalog()
+            # list_catalog swallows Square errors into an empty catalog, don't hold on to one
+            if not catalog.available_services:
+                return catalog
+            _catalog, _catalog_expires_at = catalog, time.monotonic() + APPOINTMENT_CATALOG_TTL_SECS
+        return _catalog
+
+
+def format_catalog(available_services: Dict[Optional[str], HairService]) -> str:
+    """Render services in the exact "Available Services" format from the agent's system prompt."""
+    lines = ["Available Services:"]
+    for service_name, service in available_services.items():
+        duration = "N/A" if service.service_duration_mins is None else f"{service.service_duration_mins:g}"
+        cost = "N/A" if service.cost is None else f"{service.cost:.2f}"
+        lines.extend(["", f"Service: {service_name}", f"Duration: {duration} minutes", f"Cost: ${cost}"])
+    return "\n".join(lines)
+
+
+def format_available_slots(service_name: str, slots: Dict[str, List[str]]) -> str:
+    if not slots:
+        return f"There are no open slots for {service_name} in the next few days."
+    lines = [f"Open slots for {service_name}:"]
+    for day, times in slots.items():
+        lines.append(f"{day}: {', '.join(times)}")
+    return "\n".join(lines)
+
+
+def find_service_name(message: str, available_services: Dict[Optional[str], HairService]) -> Optional[str]:
+    """The one catalog service named in message, or None if none or several are."""
+    message_lower = message.lower()
+    named = [name for name in available_services if name and name.lower() in message_lower]
+    # A name that's part of a longer matched name ("Cut" in "Buzz Cut") doesn't count separately
+    named = [name for name in named if not any(name != other and name.lower() in other.lower() for other in named)]
+    return named[0] if len(named) == 1 else None
+
+
+def route_appointment_query(message: str) -> Optional[str]:
+    """Answer a catalog listing or date-free open slot lookup directly, or return None to leave it to the agent."""
+    if BOOKING_PATTERN.search(message) or AGENT_QUESTION_PATTERN.search(message):
+        return None
+
+    if SLOTS_PATTERN.search(message):
+        catalog = get_catalog()
+        service_name = find_service_name(message, catalog.available_services)
+        if service_name is None:
+            # The agent asks which service they mean
+            return None
+        # Service names may contain digits or day-like words of their own
+        if DATE_TIME_PATTERN.search(re.sub(re.escape(service_name), "", message, flags=re.IGNORECASE)):
+            return None
+        service = catalog.available_services[service_name]
+        logger.info(f"Answering open slot lookup for {service_name} without the agent")
+        # Pass the window explicitly, the DAO's defaults are evaluated once at import
+        now = datetime.now()
+        with traced_call("square", "bookings.search_availability"):
+            slots = appointments_dao.get_available_slots(
+                service_id=service.service_variation_id,
+                start_date=now,
+                end_date=now + timedelta(days=SLOT_LOOKAHEAD_DAYS),
+            )
+        return format_available_slots(service_name, slots)
+
+    if CATALOG_LISTING_PATTERN.search(message):
+        catalog = get_catalog()
+        if not catalog.available_services:
+            return None
+        logger.info("Answering catalog listing without the agent")
+        return format_catalog(catalog.available_services)
+
+    return None
+
+
+def answer_without_agent(agent: Agent, message: str) -> Optional[str]:
+    """
+    Route message, recording the exchange in the agent's history if it was answered directly.
+
+    Must run while holding the agent's session, since it edits the history.
+    """
+    reply = route_appointment_query(message)
+    if reply is not None:
+        agent.messages.extend([
+            {"role": "user", "content": [{"text": message}]},
+            {"role": "assistant", "content": [{"text": reply}]},
+        ])
+    return reply
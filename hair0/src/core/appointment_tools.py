@@ -5,6 +5,7 @@ Wrapper functions as tools for Hair Service Appointment Booking Agent
 from datetime import datetime
 from typing import Any, Dict, List
 from strands import tool
+from src.core.turn_tracing import traced_call
 from src.services.square_appointments_dao import SquareAppointmentsDao, CatalogResponse
 
 
@@ -13,18 +14,21 @@ appointments_dao = SquareAppointmentsDao()
 
 @tool
 def list_catalog() -> CatalogResponse:
-    return appointments_dao.list_catalog()
+    with traced_call("square", "catalog.list"):
+        return appointments_dao.list_catalog()
 
 
 @tool
 def get_available_slots(service_name: str) -> Dict[str, List[str]]:
     # Need to refetch since Agent LLM call internally processes list_catalog response and
     # customer service selection inputting as service_name string
-    catalog_response = appointments_dao.list_catalog()
+    with traced_call("square", "catalog.list"):
+        catalog_response = appointments_dao.list_catalog()
     if service_name not in catalog_response.available_services:
         raise Exception("Customer selected service does not exist in current catalog!")
     service_variation_id = catalog_response.available_services[service_name].service_variation_id
-    response = appointments_dao.get_available_slots(service_id=service_variation_id)
+    with traced_call("square", "bookings.search_availability"):
+        response = appointments_dao.get_available_slots(service_id=service_variation_id)
     return response
 
 
@@ -49,9 +53,10 @@ def create_appointment_booking(
     service_variation_version: int,
     team_member_id: str,
 ) -> Dict[str, Any]: 
-    return appointments_dao.create_booking(
-        start_at=start_at,
-        service_variation_id=service_variation_id,
-        service_variation_version=service_variation_version,
-        team_member_id=team_member_id,
-    )
+    with traced_call("square", "bookings.create"):
+        return appointments_dao.create_booking(
+            start_at=start_at,
+            service_variation_id=service_variation_id,
+            service_variation_version=service_variation_version,
+            team_member_id=team_member_id,
+        )
@@ -4,44 +4,56 @@ Hairstyle Consultation Agent
 An expert agent that suggests suiting hairstyles based on user face anatomy
 """
 
+import asyncio
 import logging
-from typing import Any, List
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+import requests
 from strands import Agent
 from mcp.client.streamable_http import streamablehttp_client
-from strands.tools.mcp import MCPClient
 from strands.types.exceptions import MCPClientInitializationError
+from src.core.agent_utils import create_strands_claude_agent
 from src.core.consultation_tools import describe_face_shape, search_knowledge_base
-from contextlib import contextmanager
+from src.core.persistent_mcp_client import PersistentMCPClient
+from src.config.config import (
+    FACE_SERVICE_MCP_URL,
+    FACE_SERVICE_READY_POLL_SECS,
+    FACE_SERVICE_READY_TIMEOUT_SECS,
+    FACE_SERVICE_READY_URL,
+    MCP_TOOL_DISCOVERY_INTERVAL_SECS,
+)
 
 logger = logging.getLogger(__name__)
 
 
-face_shape_descriptor_http_mcp_client = MCPClient(lambda: streamablehttp_client(
-    "http://localhost:8001/mcp"
-))
+# One long-lived session shared by every agent, connected on first use
+face_shape_descriptor_http_mcp_client = PersistentMCPClient(
+    lambda: streamablehttp_client(FACE_SERVICE_MCP_URL),
+    name="face shape descriptor MCP server",
+)
 
-@contextmanager
-def get_mcp_client():
-    with face_shape_descriptor_http_mcp_client as client:
-        yield client
 
+def get_mcp_client() -> PersistentMCPClient:
+    return face_shape_descriptor_http_mcp_client
 
-def create_strands_claude_agent(agent_name: str, system_prompt: str, tools: List[Any]) -> Agent:
-    agent = Agent(
-        model="us.anthropic.claude-3-7-sonnet-20250219-v1:0",
-        system_prompt=system_prompt,
-        tools=tools,
-        callback_handler=None
-    )
-    logger.info(f"{agent_name} created successfully!!")
-    logger.info(f"Available tools: {[tool.tool_name for tool in tools]}")
-    return agent
 
+def wait_for_face_service_ready(timeout: float = FACE_SERVICE_READY_TIMEOUT_SECS) -> bool:
+    """Poll the face shape service's readiness endpoint until its models are warm or timeout elapses."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if requests.get(FACE_SERVICE_READY_URL, timeout=2).status_code == 200:
+                return True
+        except requests.exceptions.RequestException:
+            pass
+        if time.monotonic() >= deadline:
+            logger.warning(f"Face shape service not ready after {timeout}s")
+            return False
+        time.sleep(FACE_SERVICE_READY_POLL_SECS)
 
-def create_consultation_agent() -> Agent:
-    """Create the consultation agent with expert knowledge."""
 
-    system_prompt = """You are a world-renowned barber and hairstylist with deep knowledge of various topics, enabling you to give a client a tailored consultation and hairstyle recommendation. Those topics include:
+CONSULTATION_SYSTEM_PROMPT = """You are a world-renowned barber and hairstylist with deep knowledge of various topics, enabling you to give a client a tailored consultation and hairstyle recommendation. Those topics include:
 
 HAIRSTYLES:
 - Names: Buzzcut, Wolfcut, Textured Fringe, Edgar, Brushback, Mullet, Combover, Gentleman's
@@ -75,15 +87,80 @@ TOOLS AVAILABLE:
 
 The flow should be simple, understandble, and consistent. Please rely on your tools to guide you to the next step."""
 
+
+def load_consultation_tools(wait_for_face_service: bool = True) -> List[Any]:
+    """Discover the consultation tools once, so every session's agent can share them."""
     local_tools = [search_knowledge_base]
 
+    if wait_for_face_service:
+        # Wait out the face service's warm-up instead of coming up without its tools
+        wait_for_face_service_ready()
+
     try:
-        with get_mcp_client() as mcp_client:
-            face_shape_descriptor_tools = mcp_client.list_tools_sync()
+        face_shape_descriptor_tools = get_mcp_client().list_tools_sync()
+        return [*local_tools, *face_shape_descriptor_tools]
 
-            # Create the agent with local and MCP tools
-            return create_strands_claude_agent("Hair Consultation Agent", system_prompt, [*local_tools, *face_shape_descriptor_tools])
-    
     except MCPClientInitializationError:
-        # Fallback to agent with local_tools if HTTP MCP connections can't be created
-        return create_strands_claude_agent("Hair Consultation Agent", system_prompt, [*local_tools])
+        # Fallback to local_tools if HTTP MCP connections can't be created
+        return [*local_tools]
+
+
+def create_consultation_agent(tools: Optional[List[Any]] = None) -> Agent:
+    """Create the consultation agent with expert knowledge, discovering its tools unless they're given."""
+    if tools is None:
+        tools = load_consultation_tools()
+    return create_strands_claude_agent("Hair Consultation Agent", CONSULTATION_SYSTEM_PROMPT, tools)
+
+
+class ConsultationToolset:
+    """Tools shared by every consultation agent, discovered in the background after startup."""
+
+    def __init__(self):
+        self.tools: List[Any] = []
+        self._ready = threading.Event()
+        self.discovered_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def tool_names(self) -> List[str]:
+        return [tool.tool_name for tool in self.tools]
+
+    def update(self, tools: List[Any]) -> List[Any]:
+        """Take a fresh discovery's tools, returning the ones that weren't known before."""
+        known = set(self.tool_names)
+        new_tools = [tool for tool in tools if tool.tool_name not in known]
+        # Keep tools that have dropped out, e.g. while the face service restarts, agents still hold them
+        self.tools = [*self.tools, *new_tools]
+        self.discovered_at = time.time()
+        self._ready.set()
+        return new_tools
+
+    def status(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "tools": self.tool_names, "discovered_at": self.discovered_at}
+
+
+async def discover_consultation_tools(
+    toolset: ConsultationToolset,
+    on_new_tools: Callable[[List[Any]], None],
+    interval: float = MCP_TOOL_DISCOVERY_INTERVAL_SECS,
+) -> None:
+    """
+    Discover the consultation tools into toolset, then rediscover them every interval seconds until
+    cancelled, so MCP tools that weren't reachable at startup are picked up once their server is.
+    """
+    wait_for_face_service = True
+    while True:
+        try:
+            tools = await asyncio.to_thread(load_consultation_tools, wait_for_face_service)
+            new_tools = toolset.update(tools)
+            if new_tools:
+                logger.info(f"Discovered consultation tools: {[tool.tool_name for tool in new_tools]}")
+                on_new_tools(new_tools)
+        except Exception as e:
+            logger.error(f"Consultation tool discovery failed: {e!r}")
+        # Only the first discovery waits for the face service's warm-up
+        wait_for_face_service = False
+        await asyncio.sleep(interval)
@@ -0,0 +1,219 @@
+"""
+Bounded Conversation History
+
+Every turn resends an agent's whole history, so prompt size (and with it latency and cost) would
+otherwise grow for as long as a session lives. Once the history is estimated to be over
+AGENT_HISTORY_MAX_TOKENS, it's compacted in two steps, keeping the most recent turns verbatim:
+
+1. Large tool results from older turns (knowledge base JSON, slot maps) are replaced with a short
+   summary of their shape and a preview.
+2. If that isn't enough, the oldest turns are folded into a rolling summary carried at the start of
+   the history, one line per turn.
+
+Compaction is deterministic string work, so it never adds a model round trip to a turn.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+from strands import Agent
+from strands.agent.conversation_manager import ConversationManager
+from strands.types.content import Message, Messages
+from strands.types.exceptions import ContextWindowOverflowException
+from src.config.config import (
+    AGENT_HISTORY_KEEP_RECENT_TURNS,
+    AGENT_HISTORY_MAX_TOKENS,
+    AGENT_HISTORY_SUMMARY_MAX_CHARS,
+    AGENT_HISTORY_TOOL_RESULT_MAX_CHARS,
+)
+from src.core.turn_metrics import history_compacted_tokens_total, history_compactions_total, history_tokens
+from src.core.turn_tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English text and JSON with Claude's tokenizer
+CHARS_PER_TOKEN = 4
+SUMMARY_HEADER = "Summary of earlier turns in this conversation:"
+# Characters of each compacted tool result, user message and reply kept as a preview
+PREVIEW_CHARS = 160
+
+
+def _clip(text: str, limit: int = PREVIEW_CHARS) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def _content_chars(content: Dict[str, Any]) -> int:
+    if "text" in content:
+        return len(content["text"])
+    if "toolUse" in content:
+        return len(json.dumps(content["toolUse"].get("input", {}))) + len(content["toolUse"].get("name", ""))
+    if "toolResult" in content:
+        return sum(_content_chars(result_content) for result_content in content["toolResult"].get("content", []))
+    if "json" in content:
+        return len(json.dumps(content["json"]))
+    # Images and documents aren't kept in these agents' histories, count them as small
+    return 0
+
+
+def estimate_tokens(messages: Messages) -> int:
+    return sum(_content_chars(content) for message in messages for content in message["content"]) // CHARS_PER_TOKEN
+
+
+def _is_turn_start(message: Message) -> bool:
+    """A user prompt, as opposed to the user message that carries tool results back to the model."""
+    return message["role"] == "user" and not any("toolResult" in content for content in message["content"])
+
+
+def _tool_result_text(tool_result: Dict[str, Any]) -> str:
+    return "\n".join(
+        content["text"] if "text" in content else json.dumps(content["json"])
+        for content in tool_result.get("content", [])
+        if "text" in content or "json" in content
+    )
+
+
+def summarize_tool_result(tool_name: str, tool_result: Dict[str, Any]) -> str:
+    """A one-line stand-in for a tool result: its shape, size and a preview."""
+    text = _tool_result_text(tool_result)
+    shape = ""
+    try:
+        parsed = json.loads(text)
+        if isinstance(parsed, list):
+            shape = f" {len(parsed)} items,"
+        elif isinstance(parsed, dict):
+            shape = f" fields {', '.join(list(parsed)[:8])},"
+    except ValueError:
+        pass
+    return (
+        f"[Earlier {tool_name} result ({tool_result.get('status', 'success')}),{shape} "
+        f"compacted from {len(text)} chars: {_clip(text)}]"
+    )
+
+
+def _summarize_turn(turn: Messages) -> str:
+    user_text = next(
+        (content["text"] for content in turn[0]["content"]
+         if "text" in content and not content["text"].startswith(SUMMARY_HEADER)),
+        "",
+    )
+    tool_names = list(dict.fromkeys(
+        content["toolUse"]["name"] for message in turn for content in message["content"] if "toolUse" in content
+    ))
+    replies = [message for message in turn if message["role"] == "assistant"]
+    reply_text = " ".join(content["text"] for content in replies[-1]["content"] if "text" in content) if replies else ""
+    tools = f" | Tools: {', '.join(tool_names)}" if tool_names else ""
+    return f"- User: {_clip(user_text)}{tools} | Assistant: {_clip(reply_text)}"
+
+
+class CompactingConversationManager(ConversationManager):
+    """Keeps an agent's history under a token budget by compacting old tool results, then old turns."""
+
+    def __init__(
+        self,
+        max_tokens: int = AGENT_HISTORY_MAX_TOKENS,
+        keep_recent_turns: int = AGENT_HISTORY_KEEP_RECENT_TURNS,
+        tool_result_max_chars: int = AGENT_HISTORY_TOOL_RESULT_MAX_CHARS,
+        summary_max_chars: int = AGENT_HISTORY_SUMMARY_MAX_CHARS,
+    ):
+        self.max_tokens = max_tokens
+        self.keep_recent_turns = max(1, keep_recent_turns)
+        self.tool_result_max_chars = tool_result_max_chars
+        self.summary_max_chars = summary_max_chars
+
+    def apply_management(self, agent: Agent) -> None:
+        """Compact the history if it's over budget, runs at the end of every turn."""
+        self._compact(agent, self.max_tokens, self.keep_recent_turns)
+        history_tokens.labels(agent=agent.name).observe(estimate_tokens(agent.messages))
+
+    def reduce_context(self, agent: Agent, e: Optional[Exception] = None) -> None:
+        """The prompt overflowed the model's context window, fold everything but the current turn into the summary."""
+        if not self._compact(agent, 0, 1):
+            raise ContextWindowOverflowException("Conversation history can't be compacted any further") from e
+
+    def _compact(self, agent: Agent, max_tokens: int, keep_recent_turns: int) -> bool:
+        """Compact agent's history down towards max_tokens, returning whether anything was compacted."""
+        messages = agent.messages
+        tokens_before = estimate_tokens(messages)
+        if tokens_before <= max_tokens:
+            return False
+
+        turn_starts = [index for index, message in enumerate(messages) if _is_turn_start(message)]
+        if len(turn_starts) <= keep_recent_turns:
+            return False
+
+        with tracer.start_as_current_span("compact_history", attributes={"gen_ai.agent.name": agent.name}) as span:
+            compacted_results = self._compact_tool_results(messages, turn_starts[-keep_recent_turns])
+            summarized_turns = 0
+            if estimate_tokens(messages) > max_tokens:
+                summarized_turns = self._summarize_turns(messages, turn_starts, keep_recent_turns, max_tokens)
+
+            tokens_after = estimate_tokens(messages)
+            span.set_attributes({
+                "hair0.history.tokens_before": tokens_before,
+                "hair0.history.tokens_after": tokens_after,
+                "hair0.history.compacted_tool_results": compacted_results,
+                "hair0.history.summarized_turns": summarized_turns,
+            })
+
+        if compacted_results:
+            history_compactions_total.labels(agent=agent.name, kind="tool_results").inc()
+        if summarized_turns:
+            history_compactions_total.labels(agent=agent.name, kind="turns").inc()
+        history_compacted_tokens_total.labels(agent=agent.name).inc(max(0, tokens_before - tokens_after))
+        logger.info(
+            f"Compacted {agent.name} history from ~{tokens_before} to ~{tokens_after} tokens "
+            f"({compacted_results} tool results, {summarized_turns} turns summarized)"
+        )
+        return bool(compacted_results or summarized_turns)
+
+    def _compact_tool_results(self, messages: Messages, recent_start: int) -> int:
+        """Replace large tool results before recent_start with summaries, returning how many were replaced."""
+        tool_names = {
+            content["toolUse"]["toolUseId"]: content["toolUse"]["name"]
+            for message in messages[:recent_start] for content in message["content"] if "toolUse" in content
+        }
+        compacted = 0
+        for message in messages[:recent_start]:
+            for content in message["content"]:
+                tool_result = content.get("toolResult")
+                if tool_result is None or sum(map(_content_chars, tool_result.get("content", []))) <= self.tool_result_max_chars:
+                    continue
+                tool_name = tool_names.get(tool_result["toolUseId"], "tool")
+                # toolUseId and status stay, the result still has to pair with its toolUse
+                content["toolResult"] = {**tool_result, "content": [{"text": summarize_tool_result(tool_name, tool_result)}]}
+                compacted += 1
+        return compacted
+
+    def _summarize_turns(self, messages: Messages, turn_starts: List[int], keep_recent_turns: int, max_tokens: int) -> int:
+        """Fold the oldest turns into the rolling summary until under max_tokens, returning how many were folded."""
+        # Fold whole turns so tool uses are never separated from their results
+        boundaries = [*turn_starts[1:], len(messages)]
+        tokens = estimate_tokens(messages)
+        folded = 0
+        while folded < len(turn_starts) - keep_recent_turns and tokens > max_tokens:
+            tokens -= estimate_tokens(messages[turn_starts[folded] if folded else 0:boundaries[folded]])
+            folded += 1
+        if not folded:
+            return 0
+
+        cut = turn_starts[folded]
+        previous_summary = next(
+            (content["text"] for content in messages[0]["content"]
+             if "text" in content and content["text"].startswith(SUMMARY_HEADER)),
+            None,
+        )
+        lines = previous_summary.splitlines()[1:] if previous_summary else []
+        lines.extend(
+            _summarize_turn(messages[turn_starts[index] if index else 0:boundaries[index]]) for index in range(folded)
+        )
+        # Oldest lines go first once the summary itself is over budget
+        while lines and sum(len(line) + 1 for line in lines) > self.summary_max_chars:
+            lines.pop(0)
+
+        remaining = messages[cut:]
+        # Carried in the first remaining prompt, a separate user message would break role alternation
+        first_prompt = remaining[0]
+        remaining[0] = {**first_prompt, "content": [{"text": "\n".join([SUMMARY_HEADER, *lines])}, *first_prompt["content"]]}
+        messages[:] = remaining
+        return folded
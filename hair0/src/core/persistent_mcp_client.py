@@ -0,0 +1,140 @@
+"""
+Persistent MCP Client
+
+A long-lived MCPClient shared by every chat turn, instead of opening a fresh MCP session around each
+one. It connects lazily on first use, is pinged by a background health check, and reconnects with
+exponential backoff after the connection drops. Tool calls are multiplexed over the one session, so
+concurrent turns can call tools at the same time.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent import futures
+from typing import Any, List
+from strands.tools.mcp import MCPClient
+from strands.tools.mcp.mcp_agent_tool import MCPAgentTool
+from strands.types.exceptions import MCPClientInitializationError
+from strands.types.tools import ToolResult
+from src.config.config import (
+    MCP_HEALTH_CHECK_INTERVAL_SECS,
+    MCP_PING_TIMEOUT_SECS,
+    MCP_RECONNECT_BACKOFF_MAX_SECS,
+    MCP_RECONNECT_BACKOFF_SECS,
+)
+from src.core.turn_tracing import traced_call
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentMCPClient(MCPClient):
+    def __init__(self, transport_callable, name: str = "MCP server"):
+        super().__init__(transport_callable)
+        self.name = name
+        self._connect_lock = threading.Lock()
+        self._failed_attempts = 0
+        self._next_attempt_at = 0.0
+        self._has_connected = False
+
+    @property
+    def connected(self) -> bool:
+        return self._is_session_active()
+
+    def ensure_connected(self) -> "PersistentMCPClient":
+        """Connect if not already connected, raising MCPClientInitializationError while backing off."""
+        if self._is_session_active():
+            return self
+        with self._connect_lock:
+            if self._is_session_active():
+                return self
+            now = time.monotonic()
+            if now < self._next_attempt_at:
+                raise MCPClientInitializationError(
+                    f"{self.name} unavailable, next reconnect attempt in {self._next_attempt_at - now:.1f}s"
+                )
+            self._reset_dead_session()
+            try:
+                self.start()
+            except MCPClientInitializationError:
+                self._failed_attempts += 1
+                backoff = min(MCP_RECONNECT_BACKOFF_SECS * 2 ** (self._failed_attempts - 1), MCP_RECONNECT_BACKOFF_MAX_SECS)
+                self._next_attempt_at = time.monotonic() + backoff
+                logger.warning(f"Could not connect to {self.name}, retrying in {backoff:.1f}s")
+                raise
+            self._failed_attempts = 0
+            self._next_attempt_at = 0.0
+            self._has_connected = True
+            logger.info(f"Connected to {self.name}")
+            return self
+
+    def _reset_dead_session(self) -> None:
+        # A session whose connection dropped leaves its background thread finished but the init
+        # future already resolved, which would make start() report success without connecting.
+        # These are the same fields MCPClient.stop() resets, it can't run once the loop has exited.
+        if self._background_thread is not None:
+            self._init_future = futures.Future()
+            self._close_event = asyncio.Event()
+            self._background_thread = None
+
+    def list_tools_sync(self) -> List[MCPAgentTool]:
+        self.ensure_connected()
+        return super().list_tools_sync()
+
+    def call_tool_sync(self, tool_use_id: str, name: str, arguments: dict[str, Any] | None = None, read_timeout_seconds=None) -> ToolResult:
+        try:
+            self.ensure_connected()
+        except MCPClientInitializationError as e:
+            return ToolResult(status="error", toolUseId=tool_use_id, content=[{"text": f"Tool execution failed: {e}"}])
+
+        with traced_call("face_service", name):
+            result = super().call_tool_sync(tool_use_id, name, arguments, read_timeout_seconds)
+        if result["status"] == "error" and not self._is_session_active():
+            # The connection dropped under the call, retry once on a fresh session
+            logger.warning(f"Connection to {self.name} dropped during {name}, reconnecting")
+            try:
+                self.ensure_connected()
+            except MCPClientInitializationError:
+                return result
+            with traced_call("face_service", name):
+                result = super().call_tool_sync(tool_use_id, name, arguments, read_timeout_seconds)
+        return result
+
+    def check_health(self) -> bool:
+        """
+        Ping the server over the open session, reconnecting if it doesn't answer.
+
+        Does nothing before the first successful connection, connecting stays lazy.
+        """
+        if not self._has_connected:
+            return False
+        if self._is_session_active():
+            try:
+                ping = asyncio.run_coroutine_threadsafe(
+                    self._background_thread_session.send_ping(), self._background_thread_event_loop
+                )
+                ping.result(timeout=MCP_PING_TIMEOUT_SECS)
+                return True
+            except Exception as e:
+                logger.warning(f"Health check ping to {self.name} failed: {e!r}")
+                self.close()
+        try:
+            self.ensure_connected()
+            return True
+        except MCPClientInitializationError:
+            return False
+
+    def close(self) -> None:
+        with self._connect_lock:
+            if self._is_session_active():
+                try:
+                    self.stop(None, None, None)
+                except Exception as e:
+                    logger.warning(f"Error closing connection to {self.name}: {e!r}")
+
+
+async def run_mcp_health_checks(client: PersistentMCPClient, interval: float = MCP_HEALTH_CHECK_INTERVAL_SECS) -> None:
+    """Health check client every interval seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(client.check_health)
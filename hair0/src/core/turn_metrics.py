@@ -0,0 +1,96 @@
+"""
+Prometheus metrics for chat turns
+
+Break a chat turn down into model calls, tool calls and external I/O (Square, the face service),
+served in the Prometheus text format on /metrics. Nothing here depends on an OTEL collector being
+reachable.
+"""
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest
+
+# Seconds, spanning a cached catalog lookup up to a multi-tool turn
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Estimated tokens of conversation history
+HISTORY_TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+# Kept apart from prometheus_client's default registry, /metrics only serves these
+REGISTRY = CollectorRegistry()
+
+turn_duration_seconds = Histogram(
+    "agent_turn_duration_seconds",
+    "Wall time of an agent turn by outcome (success, error)",
+    labelnames=("agent", "outcome"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+turn_time_to_first_token_seconds = Histogram(
+    "agent_turn_time_to_first_token_seconds",
+    "Time from the start of an agent turn to its first streamed text",
+    labelnames=("agent",),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+turn_timeouts_total = Counter(
+    "agent_turn_timeouts_total",
+    "Agent turns the request gave up on after the turn timeout",
+    labelnames=("agent",),
+    registry=REGISTRY,
+)
+model_call_duration_seconds = Histogram(
+    "agent_model_call_duration_seconds",
+    "Wall time of each model call (one per event loop cycle) by outcome",
+    labelnames=("agent", "model", "outcome"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+model_time_to_first_token_seconds = Histogram(
+    "agent_model_time_to_first_token_seconds",
+    "Time from sending a model request to its first streamed content",
+    labelnames=("agent", "model"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+model_tokens_total = Counter(
+    "agent_model_tokens_total",
+    "Tokens used by model calls by kind (input, output)",
+    labelnames=("agent", "model", "kind"),
+    registry=REGISTRY,
+)
+tool_call_duration_seconds = Histogram(
+    "agent_tool_call_duration_seconds",
+    "Wall time of each tool call by result status (success, error)",
+    labelnames=("tool", "status"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+external_call_duration_seconds = Histogram(
+    "external_call_duration_seconds",
+    "Wall time of calls to external services (square, face_service) by outcome",
+    labelnames=("service", "operation", "outcome"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+history_tokens = Histogram(
+    "agent_history_tokens",
+    "Estimated tokens of conversation history an agent carries into its next turn",
+    labelnames=("agent",),
+    buckets=HISTORY_TOKEN_BUCKETS,
+    registry=REGISTRY,
+)
+history_compactions_total = Counter(
+    "agent_history_compactions_total",
+    "History compactions by kind (tool_results, turns)",
+    labelnames=("agent", "kind"),
+    registry=REGISTRY,
+)
+history_compacted_tokens_total = Counter(
+    "agent_history_compacted_tokens_total",
+    "Estimated tokens of conversation history removed by compaction",
+    labelnames=("agent",),
+    registry=REGISTRY,
+)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    return generate_latest(REGISTRY).decode()
@@ -0,0 +1,188 @@
+"""
+Chat Turn Tracing
+
+Breaks each chat turn down into model calls, tool calls and external I/O, so a slow turn can be
+pinned on Bedrock, Square or the face service. Everything is recorded twice: as OTEL spans (exported
+over OTLP, e.g. to Langfuse, when OTEL_EXPORTER_OTLP_ENDPOINT is set) and as local metrics served on
+/metrics, which work without any collector.
+
+Strands already emits spans for the agent, each event loop cycle, each model call and each tool call.
+This module adds a chat_turn span around them with the turn's time to first token, spans for the
+external calls tools make, and the metrics in src.core.turn_metrics.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, AsyncGenerator, Iterator, List, Optional
+from opentelemetry import trace
+from strands.models.bedrock import BedrockModel
+from strands.types.tools import AgentTool, ToolResult, ToolSpec, ToolUse
+from src.core.turn_metrics import (
+    external_call_duration_seconds,
+    model_call_duration_seconds,
+    model_time_to_first_token_seconds,
+    model_tokens_total,
+    tool_call_duration_seconds,
+    turn_duration_seconds,
+    turn_time_to_first_token_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("hair0")
+
+_telemetry_configured = False
+_telemetry_lock = threading.Lock()
+
+
+def setup_telemetry() -> None:
+    """Export spans over OTLP if OTEL_EXPORTER_OTLP_ENDPOINT is set, otherwise only /metrics is recorded."""
+    global _telemetry_configured
+    with _telemetry_lock:
+        if _telemetry_configured or not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            return
+        from strands.telemetry import StrandsTelemetry
+
+        # Spans are exported in batches off the request path, an unreachable collector only costs log lines
+        StrandsTelemetry().setup_otlp_exporter()
+        _telemetry_configured = True
+        logger.info(f"Exporting traces to {os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT')}")
+
+
+@contextmanager
+def traced_call(service: str, operation: str) -> Iterator[None]:
+    """Time a call to an external service as a client span and into external_call_duration_seconds, usable as a decorator."""
+    start = time.perf_counter()
+    outcome = "error"
+    with tracer.start_as_current_span(
+        f"{service} {operation}",
+        kind=trace.SpanKind.CLIENT,
+        attributes={"peer.service": service, "hair0.operation": operation},
+    ):
+        try:
+            yield
+            outcome = "success"
+        finally:
+            external_call_duration_seconds.labels(service=service, operation=operation, outcome=outcome).observe(
+                time.perf_counter() - start
+            )
+
+
+class TurnTrace:
+    def __init__(self, agent_name: str, span: trace.Span):
+        self.agent_name = agent_name
+        self.span = span
+        self.started_at = time.perf_counter()
+        self.time_to_first_token: Optional[float] = None
+
+    def first_token(self) -> None:
+        """Record the time to first token, on the turn's first streamed text only."""
+        if self.time_to_first_token is not None:
+            return
+        self.time_to_first_token = time.perf_counter() - self.started_at
+        turn_time_to_first_token_seconds.labels(agent=self.agent_name).observe(self.time_to_first_token)
+        self.span.set_attribute("hair0.turn.time_to_first_token_ms", self.time_to_first_token * 1000)
+
+
+@contextmanager
+def trace_turn(agent_name: str, session_id: str) -> Iterator[TurnTrace]:
+    """
+    Trace one agent turn as the current chat_turn span, which the agent's own spans nest under.
+
+    Must be entered in the context the agent runs in (inside its event loop), not around it.
+    """
+    outcome = "error"
+    with tracer.start_as_current_span(
+        "chat_turn",
+        attributes={"gen_ai.agent.name": agent_name, "session.id": session_id},
+    ) as span:
+        turn = TurnTrace(agent_name, span)
+        try:
+            yield turn
+            outcome = "success"
+        finally:
+            turn_duration_seconds.labels(agent=agent_name, outcome=outcome).observe(time.perf_counter() - turn.started_at)
+
+
+class InstrumentedBedrockModel(BedrockModel):
+    """BedrockModel that records each call's duration, time to first token and token usage."""
+
+    def __init__(self, agent_name: str, **model_config: Any):
+        super().__init__(**model_config)
+        self.agent_name = agent_name
+
+    async def stream(self, request: dict[str, Any]) -> AsyncGenerator[Any, None]:
+        labels = {"agent": self.agent_name, "model": self.config["model_id"]}
+        start = time.perf_counter()
+        first_token_at: Optional[float] = None
+        outcome = "error"
+        try:
+            async for chunk in super().stream(request):
+                if first_token_at is None and "contentBlockDelta" in chunk:
+                    first_token_at = time.perf_counter() - start
+                    model_time_to_first_token_seconds.labels(**labels).observe(first_token_at)
+                    # Strands' model span isn't current here, the event lands on the chat_turn span
+                    trace.get_current_span().add_event(
+                        "model_first_token", {"hair0.model.time_to_first_token_ms": first_token_at * 1000}
+                    )
+                if "metadata" in chunk:
+                    usage = chunk["metadata"].get("usage", {})
+                    model_tokens_total.labels(kind="input", **labels).inc(usage.get("inputTokens", 0))
+                    model_tokens_total.labels(kind="output", **labels).inc(usage.get("outputTokens", 0))
+                yield chunk
+            outcome = "success"
+        finally:
+            model_call_duration_seconds.labels(outcome=outcome, **labels).observe(time.perf_counter() - start)
+
+
+class InstrumentedTool(AgentTool):
+    """Wraps a tool to time its calls, and parents the spans of the external calls it makes."""
+
+    def __init__(self, tool: AgentTool):
+        super().__init__()
+        self.tool = tool
+        self._is_dynamic = tool.is_dynamic
+
+    @property
+    def tool_name(self) -> str:
+        return self.tool.tool_name
+
+    @property
+    def tool_spec(self) -> ToolSpec:
+        return self.tool.tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return self.tool.tool_type
+
+    @property
+    def supports_hot_reload(self) -> bool:
+        return self.tool.supports_hot_reload
+
+    def invoke(self, tool: ToolUse, *args: Any, **kwargs: Any) -> ToolResult:
+        start = time.perf_counter()
+        status = "error"
+        # Tools run on strands' own worker threads, outside the chat_turn context, so re-enter the
+        # event loop cycle's span for the external calls made by the tool to nest under
+        cycle_span = kwargs.get("event_loop_cycle_span")
+        try:
+            with trace.use_span(cycle_span, end_on_exit=False) if cycle_span else nullcontext():
+                result = self.tool.invoke(tool, *args, **kwargs)
+            status = result.get("status", "success")
+            return result
+        finally:
+            tool_call_duration_seconds.labels(tool=self.tool_name, status=status).observe(time.perf_counter() - start)
+
+    def get_display_properties(self) -> dict[str, str]:
+        return self.tool.get_display_properties()
+
+
+def instrument_tools(tools: List[Any]) -> List[Any]:
+    """Wrap agent tools for timing, leaving anything that isn't an AgentTool (e.g. a module path) as is."""
+    return [
+        InstrumentedTool(tool) if isinstance(tool, AgentTool) and not isinstance(tool, InstrumentedTool) else tool
+        for tool in tools
+    ]
@@ -5,23 +5,65 @@ API-only backend that serves the React frontend and provides REST endpoints.
 """
 
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST
 from pydantic import BaseModel
-from typing import Optional, AsyncGenerator
-from src.core.consultation_agent import create_consultation_agent, get_mcp_client
-import json
+from starlette.background import BackgroundTask
+from typing import AsyncGenerator, Callable, Optional
+from strands import Agent
+from src.core.agent_session_pool import AgentSession, AgentSessionPool, SessionLimitError
+from src.core.agent_turn_executor import get_agent_turn_executor, shutdown_agent_turn_executor
+from src.core.appointment_agent import create_appointment_agent
+from src.core.appointment_router import answer_without_agent
+from src.core.consultation_agent import (
+    ConsultationToolset,
+    create_consultation_agent,
+    discover_consultation_tools,
+    get_mcp_client,
+)
+from src.core.persistent_mcp_client import run_mcp_health_checks
+from src.core.turn_metrics import render_metrics
+from src.core.turn_tracing import setup_telemetry
+from src.web.sse import SSE_HEADERS, encode_agent_stream, encode_sse_event
+from src.web.static_assets import StaticAssetStore
 import asyncio
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(name)s | %(message)s")
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Turn spans go to the OTLP endpoint if one is configured, /metrics works either way
+    setup_telemetry()
+    # Agent turns run on their own worker threads, the event loop only shuttles requests and events
+    get_agent_turn_executor()
+    # Tools are discovered in the background so the server binds right away, /ready reports when they're in
+    tool_discovery_task = asyncio.create_task(
+        discover_consultation_tools(consultation_tools, consultation_sessions.add_tools)
+    )
+    # Every turn shares one MCP session to the face service, kept alive in the background
+    mcp_health_task = asyncio.create_task(run_mcp_health_checks(get_mcp_client()))
+    if static_assets is not None:
+        # Compress the frontend once, off the event loop, instead of on every request
+        asyncio.create_task(asyncio.to_thread(static_assets.precompress))
+    try:
+        yield
+    finally:
+        tool_discovery_task.cancel()
+        mcp_health_task.cancel()
+        shutdown_agent_turn_executor()
+        await asyncio.to_thread(get_mcp_client().close)
+
+
 # Create FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title="Haircut Recommendation Agent API",
     description="AI-powered haircut consultant",
     version="1.0.0",
@@ -41,151 +83,197 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Session-Id"],
 )
 
-hair_consultation_agent = create_consultation_agent()
+# Tools are discovered once and shared, each chat session gets its own agent and history
+consultation_tools = ConsultationToolset()
+consultation_sessions = AgentSessionPool(lambda: create_consultation_agent(consultation_tools.tools))
+appointment_sessions = AgentSessionPool(create_appointment_agent)
 
 
 # Pydantic models
 class ChatMessage(BaseModel):
     message: str
+    # Omit to start a new session, the response carries the id to send with follow-up messages
+    session_id: Optional[str] = None
 
 
 class ChatResponse(BaseModel):
     response: str
     success: bool
     error: Optional[str] = None
+    session_id: Optional[str] = None
 
 
-# API Routes
-@app.post("/api/chat", response_model=ChatResponse)
-async def chat(message: ChatMessage):
-    """Chat with the haircut agent."""
+# Answers a message without a model turn, or returns None to leave it to the agent
+DirectAnswer = Callable[[Agent, str], Optional[str]]
+
+
+def get_chat_session(sessions: AgentSessionPool, session_id: Optional[str]) -> AgentSession:
+    """Check out the chat's session, the turn that handles the request must release it."""
     try:
-        with get_mcp_client():
-            response = hair_consultation_agent(message.message)
-            return ChatResponse(response=str(response), success=True)
-    except Exception as e:
-        logger.error(f"Error in chat: {e}")
-        return ChatResponse(response="", success=False, error=str(e))
+        return sessions.checkout(session_id)
+    except SessionLimitError as e:
+        logger.warning(f"Rejecting chat: {e}")
+        raise HTTPException(status_code=503, detail="Too many chats in progress, retry shortly")
 
 
-@app.post("/api/chat/stream")
-async def chat_stream(message: ChatMessage):
-    """Stream chat response from the haircut agent."""
+def get_consultation_session(session_id: Optional[str]) -> AgentSession:
+    if not consultation_tools.ready:
+        raise HTTPException(status_code=503, detail="Agent is still starting up, retry shortly", headers={"Retry-After": "2"})
+    return get_chat_session(consultation_sessions, session_id)
+
+
+async def run_chat_turn(
+    sessions: AgentSessionPool,
+    session: AgentSession,
+    message: str,
+    answer_directly: Optional[DirectAnswer] = None,
+) -> ChatResponse:
+    executor = get_agent_turn_executor()
+    try:
+        response = None
+        if answer_directly is not None:
+            response = await executor.call(session, answer_directly, session.agent, message)
+        if response is None:
+            response = await executor.run(session, message)
+        return ChatResponse(response=str(response), success=True, session_id=session.session_id)
+    except Exception as e:
+        logger.error(f"Error in chat: {e}")
+        return ChatResponse(response="", success=False, error=str(e), session_id=session.session_id)
+    finally:
+        sessions.release(session)
+
+
+def stream_chat_turn(
+    sessions: AgentSessionPool,
+    session: AgentSession,
+    message: str,
+    answer_directly: Optional[DirectAnswer] = None,
+) -> StreamingResponse:
+    executor = get_agent_turn_executor()
+    released = False
+
+    def release_session() -> None:
+        nonlocal released
+        if not released:
+            released = True
+            sessions.release(session)
 
     async def generate_stream() -> AsyncGenerator[str, None]:
         try:
-            # Use the agent's streaming capability if available
-            try:
-                with get_mcp_client():
-                    # Try to use stream_async if available
-                    agent_stream = hair_consultation_agent.stream_async(message.message)
-
-                    async for event in agent_stream:
-                        if "data" in event:
-                            # Stream text chunks as they're generated
-                            chunk = {
-                                "type": "text",
-                                "content": event["data"],
-                                "done": False,
-                            }
-                            yield f"data: {json.dumps(chunk)}\n\n"
-                        elif "current_tool_use" in event and event["current_tool_use"].get(
-                            "name"
-                        ):
-                            # Stream tool usage information
-                            chunk = {
-                                "type": "tool",
-                                "content": f"Using tool: {event['current_tool_use']['name']}",
-                                "additional wtf": f"{event}",
-                                "done": False,
-                            }
-                            yield f"data: {json.dumps(chunk)}\n\n"
-
-                    # Send completion signal
-                    chunk = {"type": "done", "content": "", "done": True}
-                    yield f"data: {json.dumps(chunk)}\n\n"
-
-            except AttributeError:
-                # Fallback: simulate streaming by chunking the response
-                response = hair_consultation_agent(message.message)
-                response_text = str(response)
-
-                # Split response into chunks for streaming effect
-                chunk_size = 20
-                words = response_text.split()
-
-                for i in range(0, len(words), chunk_size):
-                    chunk_words = words[i : i + chunk_size]
-                    chunk_text = " ".join(chunk_words)
-
-                    chunk = {
-                        "type": "text",
-                        "content": chunk_text
-                        + (" " if i + chunk_size < len(words) else ""),
-                        "done": False,
-                    }
-                    yield f"data: {json.dumps(chunk)}\n\n"
-
-                    # Add small delay for streaming effect
-                    await asyncio.sleep(0.1)
-
-                # Send completion signal
-                chunk = {"type": "done", "content": "", "done": True}
-                yield f"data: {json.dumps(chunk)}\n\n"
-
+            response = None
+            if answer_directly is not None:
+                response = await executor.call(session, answer_directly, session.agent, message)
+            if response is not None:
+                yield encode_sse_event({"type": "text", "content": response})
+                yield encode_sse_event({"type": "done"})
+            else:
+                async for frame in encode_agent_stream(executor.stream(session, message)):
+                    yield frame
         except Exception as e:
             logger.error(f"Error in streaming chat: {e}")
-            error_chunk = {"type": "error", "content": f"Error: {str(e)}", "done": True}
-            yield f"data: {json.dumps(error_chunk)}\n\n"
+            yield encode_sse_event({"type": "error", "content": f"Error: {str(e)}"})
+        finally:
+            release_session()
 
+    # The session stays checked out until the stream is done, so it can't be evicted between the direct
+    # answer and the turn. The background task covers a client that's gone before the stream starts.
     return StreamingResponse(
         generate_stream(),
-        media_type="text/plain",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Content-Type": "text/event-stream",
-        },
+        media_type="text/event-stream",
+        headers={"X-Session-Id": session.session_id, **SSE_HEADERS},
+        background=BackgroundTask(release_session),
     )
 
 
+# API Routes
+@app.post("/api/chat", response_model=ChatResponse)
+async def chat(message: ChatMessage):
+    """Chat with the haircut agent."""
+    session = get_consultation_session(message.session_id)
+    return await run_chat_turn(consultation_sessions, session, message.message)
+
+
+@app.post("/api/chat/stream")
+async def chat_stream(message: ChatMessage):
+    """Stream chat response from the haircut agent."""
+    session = get_consultation_session(message.session_id)
+    return stream_chat_turn(consultation_sessions, session, message.message)
+
+
+@app.post("/api/appointments/chat", response_model=ChatResponse)
+async def appointments_chat(message: ChatMessage):
+    """Chat with the appointment booking agent, service listings and open slots are answered without a model turn."""
+    session = get_chat_session(appointment_sessions, message.session_id)
+    return await run_chat_turn(appointment_sessions, session, message.message, answer_without_agent)
+
+
+@app.post("/api/appointments/chat/stream")
+async def appointments_chat_stream(message: ChatMessage):
+    """Stream chat response from the appointment booking agent."""
+    session = get_chat_session(appointment_sessions, message.session_id)
+    return stream_chat_turn(appointment_sessions, session, message.message, answer_without_agent)
+
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "hair_consultation_agent_initialized": hair_consultation_agent is not None,
-        "version": "1.0.0",
-    }
+    """Liveness: the process is up and serving requests."""
+    return {"status": "alive", "version": "1.0.0"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: agent tools have been discovered and chats can be served. 503 until then."""
+    return JSONResponse(
+        {
+            "hair_consultation_agent_initialized": consultation_tools.ready,
+            "tools": consultation_tools.status(),
+            "face_service_connected": get_mcp_client().connected,
+            "sessions": consultation_sessions.stats(),
+            "appointment_sessions": appointment_sessions.stats(),
+        },
+        status_code=200 if consultation_tools.ready else 503,
+    )
 
 
-# Serve React app static files
-frontend_build_path = Path(__file__).parent.parent / "frontend" / "build"
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Turn, model call, tool call and external call latencies plus token counts in Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE_LATEST)
 
-if frontend_build_path.exists():
-    # Mount static files for JS/CSS bundles and public assets
-    app.mount(
-        "/static",
-        StaticFiles(directory=str(frontend_build_path / "static")),
-        name="static",
-    )
 
-    @app.get("/")
-    async def serve_react_app():
+# Serve React app static files
+frontend_build_path = Path(__file__).parent.parent / "frontend" / "build"
+static_assets = StaticAssetStore(frontend_build_path) if frontend_build_path.exists() else None
+
+if static_assets is not None:
+    # JS/CSS bundles and public assets, plus index.html, all served from memory
+    index_asset = static_assets.get("index.html")
+
+    @app.api_route("/static/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+    async def serve_static_asset(path: str, request: Request):
+        """Serve a precompressed static asset."""
+        asset = static_assets.get(f"static/{path}")
+        if asset is None:
+            raise HTTPException(status_code=404, detail="Static asset not found")
+        return static_assets.response(asset, request.headers, head=request.method == "HEAD")
+
+    @app.api_route("/", methods=["GET", "HEAD"], include_in_schema=False)
+    async def serve_react_app(request: Request):
         """Serve the React app."""
-        return FileResponse(str(frontend_build_path / "index.html"))
+        return static_assets.response(index_asset, request.headers, head=request.method == "HEAD")
 
-    @app.get("/{path:path}")
-    async def serve_react_routes(path: str):
+    @app.api_route("/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+    async def serve_react_routes(path: str, request: Request):
         """Serve React app for all other routes (SPA routing)."""
         # Check if it's an API route
         if path.startswith("api/"):
             raise HTTPException(status_code=404, detail="API endpoint not found")
 
         # Serve React app for all other routes
-        return FileResponse(str(frontend_build_path / "index.html"))
+        return static_assets.response(index_asset, request.headers, head=request.method == "HEAD")
 else:
 
     @app.get("/")
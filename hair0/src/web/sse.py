@@ -0,0 +1,113 @@
+"""
+Server-Sent Events encoding for streamed agent turns
+
+Agent turns produce one event per model token delta. Sending each as its own frame costs a JSON
+envelope and a network write per token, so text deltas are coalesced into frames that are flushed
+once they're SSE_FLUSH_MAX_CHARS long or SSE_FLUSH_INTERVAL_SECS old. Events use a minimal schema:
+
+    {"type": "text", "content": "..."}
+    {"type": "tool", "name": "search_knowledge_base", "status": "started" | "success" | "error"}
+    {"type": "done"}
+    {"type": "error", "content": "..."}
+
+A comment line is sent as a heartbeat whenever the stream has been quiet for SSE_HEARTBEAT_SECS (e.g.
+during a long tool call), so proxies and clients don't drop the connection.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict
+from src.config.config import SSE_FLUSH_INTERVAL_SECS, SSE_FLUSH_MAX_CHARS, SSE_HEARTBEAT_SECS
+
+SSE_HEARTBEAT = ": keep-alive\n\n"
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # Stop reverse proxies from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def encode_sse_event(payload: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+async def encode_agent_stream(
+    agent_events: AsyncIterator[Dict[str, Any]],
+    flush_interval: float = SSE_FLUSH_INTERVAL_SECS,
+    max_chars: int = SSE_FLUSH_MAX_CHARS,
+    heartbeat_interval: float = SSE_HEARTBEAT_SECS,
+) -> AsyncIterator[str]:
+    """Encode an agent's stream events as SSE frames, ending with a done event."""
+    loop = asyncio.get_running_loop()
+    text_buffer = []
+    buffered_chars = 0
+    buffered_since = 0.0
+    last_sent = loop.time()
+    # Tool use events repeat for every input delta, announce each tool use once
+    tool_names: Dict[str, str] = {}
+
+    def flush_text() -> str:
+        nonlocal text_buffer, buffered_chars
+        frame = encode_sse_event({"type": "text", "content": "".join(text_buffer)})
+        text_buffer, buffered_chars = [], 0
+        return frame
+
+    iterator = agent_events.__aiter__()
+    next_event = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            now = loop.time()
+            deadline = last_sent + heartbeat_interval
+            if text_buffer:
+                deadline = min(deadline, buffered_since + flush_interval)
+            # Wait without cancelling, cancelling __anext__ would close the agent's stream
+            done, _ = await asyncio.wait({next_event}, timeout=max(0.0, deadline - now))
+
+            if not done:
+                yield flush_text() if text_buffer else SSE_HEARTBEAT
+                last_sent = loop.time()
+                continue
+
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                break
+            next_event = asyncio.ensure_future(iterator.__anext__())
+
+            frames = []
+            if "data" in event:
+                if not text_buffer:
+                    buffered_since = loop.time()
+                text_buffer.append(event["data"])
+                buffered_chars += len(event["data"])
+                if buffered_chars >= max_chars:
+                    frames.append(flush_text())
+            elif "current_tool_use" in event and event["current_tool_use"].get("name"):
+                tool_use = event["current_tool_use"]
+                if tool_use.get("toolUseId") not in tool_names:
+                    tool_names[tool_use.get("toolUseId")] = tool_use["name"]
+                    if text_buffer:
+                        frames.append(flush_text())
+                    frames.append(encode_sse_event({"type": "tool", "name": tool_use["name"], "status": "started"}))
+            elif "message" in event:
+                for content in event["message"].get("content", []):
+                    tool_result = content.get("toolResult")
+                    if tool_result and tool_result.get("toolUseId") in tool_names:
+                        frames.append(encode_sse_event({
+                            "type": "tool",
+                            "name": tool_names[tool_result["toolUseId"]],
+                            "status": tool_result.get("status", "success"),
+                        }))
+
+            for frame in frames:
+                yield frame
+            if frames:
+                last_sent = loop.time()
+    finally:
+        next_event.cancel()
+
+    if text_buffer:
+        yield flush_text()
+    yield encode_sse_event({"type": "done"})
@@ -0,0 +1,170 @@
+"""
+In-memory, precompressed static asset serving for the bundled React frontend
+
+Every file under the frontend build (index.html included) is read into memory once, and compressible
+files get gzip and, if the optional brotli package is installed, brotli variants. Requests pick the best
+encoding the client accepts, with no disk reads and no per-request compression. Responses carry strong
+ETags (one per encoding) and conditional requests are answered with 304. Content-hashed bundle files
+are cached as immutable, everything else is revalidated on each use.
+
+Variants can also be built ahead of time, next to the files, with:
+
+    python -m src.web.static_assets src/frontend/build
+
+Sibling .br/.gz files found at startup are used as is, otherwise compression runs in the background
+after startup and assets are served uncompressed until it finishes.
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_SUFFIXES = {".js", ".mjs", ".css", ".html", ".svg", ".json", ".map", ".txt", ".xml", ".ico", ".wasm"}
+# Smaller files gain less from compression than the Content-Encoding round-trip costs
+MIN_COMPRESS_BYTES = 512
+# Vite output names carry an 8 character content hash, e.g. index-BxK2a9Qd.js, so they never change in place
+HASHED_NAME_PATTERN = re.compile(r"-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Preferred first
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+@dataclass
+class StaticAsset:
+    content: bytes
+    media_type: str
+    cache_control: str
+    etag: str
+    # Content-Encoding to encoded bytes
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+
+
+def _etag(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=12).hexdigest()
+
+
+def _compress(content: bytes, encoding: str) -> Optional[bytes]:
+    if encoding == "gzip":
+        # mtime=0 keeps the output (and its ETag) stable across restarts
+        return gzip.compress(content, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(content, quality=11)
+    return None
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+class StaticAssetStore:
+    def __init__(self, root: Path):
+        self.root = root
+        self.assets: Dict[str, StaticAsset] = {}
+        for path in sorted(root.rglob("*")):
+            if path.is_file() and path.suffix not in (".br", ".gz"):
+                self._load(path)
+        logger.info(f"Loaded {len(self.assets)} static assets from {root}")
+
+    def _load(self, path: Path) -> None:
+        content = path.read_bytes()
+        relative_path = path.relative_to(self.root).as_posix()
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if media_type.startswith("text/") or media_type in ("application/javascript", "image/svg+xml"):
+            media_type += "; charset=utf-8"
+        asset = StaticAsset(
+            content=content,
+            media_type=media_type,
+            cache_control=IMMUTABLE_CACHE_CONTROL if HASHED_NAME_PATTERN.search(path.name) else REVALIDATE_CACHE_CONTROL,
+            etag=_etag(content),
+        )
+        # Variants built ahead of time
+        for encoding, suffix in ENCODING_SUFFIXES.items():
+            encoded_path = path.with_name(path.name + suffix)
+            if encoded_path.exists():
+                asset.encodings[encoding] = encoded_path.read_bytes()
+        self.assets[relative_path] = asset
+
+    def get(self, relative_path: str) -> Optional[StaticAsset]:
+        return self.assets.get(relative_path)
+
+    def precompress(self) -> None:
+        """Build any missing compressed variants, keeping only those smaller than the original."""
+        compressed = 0
+        for relative_path, asset in self.assets.items():
+            if Path(relative_path).suffix not in COMPRESSIBLE_SUFFIXES or len(asset.content) < MIN_COMPRESS_BYTES:
+                continue
+            for encoding in ENCODING_SUFFIXES:
+                if encoding in asset.encodings:
+                    continue
+                encoded = _compress(asset.content, encoding)
+                if encoded is not None and len(encoded) < len(asset.content):
+                    # Publishing the finished variant is a single dict assignment, requests never see a partial one
+                    asset.encodings[encoding] = encoded
+                    compressed += 1
+        logger.info(f"Precompressed {compressed} static asset variants{'' if brotli else ' (brotli not installed, gzip only)'}")
+
+    def write_precompressed(self) -> None:
+        """Write compressed variants next to their files, for build-time precompression."""
+        self.precompress()
+        for relative_path, asset in self.assets.items():
+            for encoding, encoded in asset.encodings.items():
+                (self.root / (relative_path + ENCODING_SUFFIXES[encoding])).write_bytes(encoded)
+
+    def response(self, asset: StaticAsset, headers: Mapping[str, str], head: bool = False) -> Response:
+        """Serve asset in the best encoding the request accepts, or 304 if the client's copy is current."""
+        accepted = accepted_encodings(headers.get("accept-encoding", ""))
+        encoding = next((e for e in ENCODING_SUFFIXES if e in asset.encodings and accepted.get(e, 0) > 0), None)
+        content = asset.encodings[encoding] if encoding else asset.content
+        etag = f'"{asset.etag}-{encoding}"' if encoding else f'"{asset.etag}"'
+
+        response_headers = {
+            "ETag": etag,
+            "Cache-Control": asset.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))):
+            return Response(status_code=304, headers=response_headers)
+
+        if encoding:
+            response_headers["Content-Encoding"] = encoding
+        if head:
+            response_headers["Content-Length"] = str(len(content))
+            return Response(status_code=200, headers=response_headers, media_type=asset.media_type)
+        return Response(content=content, headers=response_headers, media_type=asset.media_type)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(name)s | %(message)s")
+    StaticAssetStore(Path(sys.argv[1])).write_precompressed()
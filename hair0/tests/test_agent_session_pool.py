@@ -0,0 +1,36 @@
+import pytest
+from src.core.agent_session_pool import AgentSessionPool, SessionLimitError
+
+
+def make_pool(max_sessions: int = 1, idle_ttl_secs: float = 60) -> AgentSessionPool:
+    return AgentSessionPool(object, max_sessions=max_sessions, idle_ttl_secs=idle_ttl_secs)
+
+
+def test_checked_out_session_is_not_evicted_for_a_new_one():
+    pool = make_pool()
+    session = pool.checkout()
+    with pytest.raises(SessionLimitError):
+        pool.checkout()
+    pool.release(session)
+    assert pool.checkout().session_id != session.session_id
+
+
+def test_checked_out_session_outlives_its_idle_ttl():
+    pool = make_pool(max_sessions=2, idle_ttl_secs=0)
+    session = pool.checkout()
+    pool.get_or_create()
+    assert pool.get_or_create(session.session_id) is session
+
+    pool.release(session)
+    session.last_used -= 1
+    assert pool.get_or_create(session.session_id) is not session
+
+
+def test_checkouts_of_the_same_session_are_counted():
+    pool = make_pool()
+    session = pool.checkout()
+    assert pool.checkout(session.session_id) is session
+    pool.release(session)
+    assert session.busy
+    pool.release(session)
+    assert not session.busy
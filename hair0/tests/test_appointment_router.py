@@ -0,0 +1,86 @@
+import pytest
+from src.core import appointment_router
+from src.services.square_appointments_dao import CatalogResponse, HairService
+
+CATALOG = CatalogResponse(available_services={
+    "Fade": HairService(service_variation_id="fade-id", service_variation_version=1, service_duration_mins=30, cost=35),
+    "Beard Trim": HairService(service_variation_id="beard-id", service_variation_version=1, service_duration_mins=15, cost=20),
+})
+
+
+class FakeAppointmentsDao:
+    def __init__(self):
+        self.slot_lookups = []
+
+    def get_available_slots(self, service_id, start_date, end_date):
+        self.slot_lookups.append(service_id)
+        return {"2026-10-19": ["10:00 AM", "11:30 AM"]}
+
+
+@pytest.fixture
+def dao(monkeypatch):
+    fake_dao = FakeAppointmentsDao()
+    monkeypatch.setattr(appointment_router, "get_catalog", lambda: CATALOG)
+    monkeypatch.setattr(appointment_router, "appointments_dao", fake_dao)
+    return fake_dao
+
+
+@pytest.mark.parametrize("message", [
+    "What services do you offer?",
+    "what services do you have",
+    "Can you list your services?",
+    "Show me your services",
+    "Could I see the menu?",
+    "Do you have a price list?",
+])
+def test_catalog_listings_are_answered_directly(dao, message):
+    assert appointment_router.route_appointment_query(message) == appointment_router.format_catalog(CATALOG.available_services)
+
+
+@pytest.mark.parametrize("message", [
+    "Which service would you recommend for thinning hair?",
+    "I have a question about your beard trim service, does it include a hot towel?",
+    "What's the difference between a taper and a fade service?",
+    "Can you compare the Fade and Beard Trim services?",
+    "Which services are good for curly hair?",
+    "Is a beard trim service included with the Fade?",
+])
+def test_questions_about_services_go_to_the_agent(dao, message):
+    assert appointment_router.route_appointment_query(message) is None
+
+
+@pytest.mark.parametrize("message", [
+    "Book me a Fade for tomorrow",
+    "Can I reschedule my booking? What services do you offer?",
+])
+def test_booking_goes_to_the_agent(dao, message):
+    assert appointment_router.route_appointment_query(message) is None
+
+
+def test_open_slots_for_a_named_service_are_answered_directly(dao):
+    reply = appointment_router.route_appointment_query("Any openings for a Fade?")
+    assert reply == appointment_router.format_available_slots("Fade", {"2026-10-19": ["10:00 AM", "11:30 AM"]})
+    assert dao.slot_lookups == ["fade-id"]
+
+
+@pytest.mark.parametrize("message", [
+    "Any openings for a Fade on Friday?",
+    "What availability do you have for a Fade after 5pm?",
+    "Which service would you recommend, and do you have any openings?",
+])
+def test_open_slot_questions_with_qualifiers_go_to_the_agent(dao, message):
+    assert appointment_router.route_appointment_query(message) is None
+    assert dao.slot_lookups == []
+
+
+def test_answered_exchanges_are_recorded_in_the_agent_history(dao):
+    class FakeAgent:
+        def __init__(self):
+            self.messages = []
+
+    agent = FakeAgent()
+    reply = appointment_router.answer_without_agent(agent, "What services do you offer?")
+    assert agent.messages == [
+        {"role": "user", "content": [{"text": "What services do you offer?"}]},
+        {"role": "assistant", "content": [{"text": reply}]},
+    ]
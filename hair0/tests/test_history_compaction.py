@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+import pytest
+from strands.types.exceptions import ContextWindowOverflowException
+from src.core.history_compaction import SUMMARY_HEADER, CompactingConversationManager, estimate_tokens
+
+
+def make_turn(index: int, tool_result_chars: int = 2000) -> list:
+    """One user prompt answered after a knowledge base tool call, the way strands records it."""
+    tool_use_id = f"tool-{index}"
+    return [
+        {"role": "user", "content": [{"text": f"Question {index} about fades and tapers"}]},
+        {"role": "assistant", "content": [
+            {"text": "Let me look that up."},
+            {"toolUse": {"toolUseId": tool_use_id, "name": "search_knowledge_base", "input": {"query": f"q{index}"}}},
+        ]},
+        {"role": "user", "content": [
+            {"toolResult": {"toolUseId": tool_use_id, "status": "success", "content": [{"text": "x" * tool_result_chars}]}},
+        ]},
+        {"role": "assistant", "content": [{"text": f"Answer {index}: a taper suits you."}]},
+    ]
+
+
+def make_agent(turns: int, **kwargs) -> SimpleNamespace:
+    return SimpleNamespace(name="consultation", messages=[message for i in range(turns) for message in make_turn(i, **kwargs)])
+
+
+def assert_well_formed(messages: list) -> None:
+    assert messages[0]["role"] == "user"
+    for previous, message in zip(messages, messages[1:]):
+        assert previous["role"] != message["role"]
+
+    for index, message in enumerate(messages):
+        tool_use_ids = [content["toolUse"]["toolUseId"] for content in message["content"] if "toolUse" in content]
+        if tool_use_ids:
+            results = [content["toolResult"]["toolUseId"] for content in messages[index + 1]["content"] if "toolResult" in content]
+            assert results == tool_use_ids
+        tool_result_ids = [content["toolResult"]["toolUseId"] for content in message["content"] if "toolResult" in content]
+        if tool_result_ids:
+            uses = [content["toolUse"]["toolUseId"] for content in messages[index - 1]["content"] if "toolUse" in content]
+            assert uses == tool_result_ids
+
+
+def test_history_under_budget_is_left_alone():
+    agent = make_agent(3)
+    before = [dict(message) for message in agent.messages]
+    CompactingConversationManager(max_tokens=100_000, keep_recent_turns=1).apply_management(agent)
+    assert agent.messages == before
+
+
+def test_old_tool_results_are_compacted_first():
+    agent = make_agent(4)
+    CompactingConversationManager(max_tokens=1000, keep_recent_turns=1, tool_result_max_chars=500).apply_management(agent)
+
+    assert len(agent.messages) == 16
+    assert_well_formed(agent.messages)
+    old_result = agent.messages[2]["content"][0]["toolResult"]
+    assert old_result["toolUseId"] == "tool-0"
+    assert old_result["content"][0]["text"].startswith("[Earlier search_knowledge_base result (success),")
+    # The most recent turn is kept verbatim
+    assert agent.messages[-2]["content"][0]["toolResult"]["content"][0]["text"] == "x" * 2000
+
+
+def test_old_turns_are_folded_into_a_summary_keeping_roles_and_tool_pairs_intact():
+    agent = make_agent(6)
+    manager = CompactingConversationManager(max_tokens=200, keep_recent_turns=2, tool_result_max_chars=500)
+    manager.apply_management(agent)
+
+    assert_well_formed(agent.messages)
+    assert len(agent.messages) == 8
+    summary = agent.messages[0]["content"][0]["text"]
+    assert summary.startswith(SUMMARY_HEADER)
+    assert "- User: Question 0 about fades and tapers | Tools: search_knowledge_base | Assistant: Answer 0" in summary
+    assert agent.messages[0]["content"][1]["text"] == "Question 4 about fades and tapers"
+
+
+def test_summary_rolls_forward_across_compactions():
+    agent = make_agent(4)
+    manager = CompactingConversationManager(max_tokens=200, keep_recent_turns=2, tool_result_max_chars=500)
+    manager.apply_management(agent)
+    agent.messages.extend(make_turn(4) + make_turn(5))
+    manager.apply_management(agent)
+
+    assert_well_formed(agent.messages)
+    summary = agent.messages[0]["content"][0]["text"]
+    assert summary.count(SUMMARY_HEADER) == 1
+    assert [line.split(" about")[0] for line in summary.splitlines()[1:]] == [f"- User: Question {i}" for i in range(4)]
+
+
+def test_reduce_context_keeps_only_the_current_turn():
+    agent = make_agent(3)
+    CompactingConversationManager(max_tokens=100_000, keep_recent_turns=2).reduce_context(agent)
+
+    assert_well_formed(agent.messages)
+    assert len(agent.messages) == 4
+    assert agent.messages[0]["content"][1]["text"] == "Question 2 about fades and tapers"
+    assert estimate_tokens(agent.messages) < estimate_tokens(make_agent(3).messages)
+
+
+def test_reduce_context_raises_when_nothing_can_be_compacted():
+    agent = make_agent(1)
+    with pytest.raises(ContextWindowOverflowException):
+        CompactingConversationManager().reduce_context(agent)
@@ -0,0 +1,79 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+from src.web.sse import SSE_HEARTBEAT, encode_agent_stream, encode_sse_event
+
+
+async def events_from(items: List[Any]):
+    """Agent stream events, a number in items pauses the stream for that many seconds."""
+    for item in items:
+        if isinstance(item, (int, float)):
+            await asyncio.sleep(item)
+        else:
+            yield item
+
+
+def encode(items: List[Any], **kwargs) -> List[str]:
+    async def collect():
+        return [frame async for frame in encode_agent_stream(events_from(items), **kwargs)]
+
+    return asyncio.run(collect())
+
+
+def payloads(frames: List[str]) -> List[Dict[str, Any]]:
+    return [json.loads(frame[len("data: "):]) for frame in frames if frame.startswith("data: ")]
+
+
+def test_encode_sse_event_is_one_compact_data_frame():
+    assert encode_sse_event({"type": "text", "content": "Hi there"}) == 'data: {"type":"text","content":"Hi there"}\n\n'
+
+
+def test_text_deltas_are_coalesced_into_one_frame():
+    frames = encode([{"data": "Hel"}, {"data": "lo"}, {"data": " there"}], flush_interval=10)
+    assert payloads(frames) == [{"type": "text", "content": "Hello there"}, {"type": "done"}]
+
+
+def test_text_is_flushed_once_it_reaches_max_chars():
+    frames = encode([{"data": "abc"}, {"data": "def"}, {"data": "g"}], flush_interval=10, max_chars=5)
+    assert payloads(frames) == [
+        {"type": "text", "content": "abcdef"},
+        {"type": "text", "content": "g"},
+        {"type": "done"},
+    ]
+
+
+def test_text_is_flushed_once_it_reaches_the_flush_interval():
+    frames = encode([{"data": "Hel"}, 0.2, {"data": "lo"}], flush_interval=0.05)
+    assert payloads(frames) == [
+        {"type": "text", "content": "Hel"},
+        {"type": "text", "content": "lo"},
+        {"type": "done"},
+    ]
+
+
+def test_tool_use_is_announced_once_and_its_result_reported():
+    tool_use = {"toolUseId": "t1", "name": "list_catalog", "input": ""}
+    frames = encode([
+        {"data": "Let me check."},
+        {"current_tool_use": tool_use},
+        {"current_tool_use": {**tool_use, "input": "{}"}},
+        {"message": {"role": "user", "content": [{"toolResult": {"toolUseId": "t1", "status": "success", "content": []}}]}},
+        {"data": "Here you go."},
+    ], flush_interval=10)
+    assert payloads(frames) == [
+        {"type": "text", "content": "Let me check."},
+        {"type": "tool", "name": "list_catalog", "status": "started"},
+        {"type": "tool", "name": "list_catalog", "status": "success"},
+        {"type": "text", "content": "Here you go."},
+        {"type": "done"},
+    ]
+
+
+def test_heartbeat_is_sent_while_the_stream_is_quiet():
+    frames = encode([0.2, {"data": "Done"}], flush_interval=10, heartbeat_interval=0.05)
+    assert SSE_HEARTBEAT in frames
+    assert payloads(frames) == [{"type": "text", "content": "Done"}, {"type": "done"}]
+
+
+def test_empty_stream_is_just_done():
+    assert encode([]) == [encode_sse_event({"type": "done"})]